@@ -0,0 +1,70 @@
+# benchmarks/append_throughput.py
+"""Compares per-row save_transaction() with the batched append paths.
+
+Run from the finance_tracker directory:
+    python -m benchmarks.append_throughput [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.store_memory import synthetic_lines
+from features.transactions import data
+from features.transactions.reader import split_line
+
+
+def warm(directory, seed_rows):
+    """Starts a ledger with seed_rows and builds every derived file, as in a ledger in use."""
+    os.chdir(directory)
+    os.mkdir("database")
+    data.save_transactions(seed_rows)
+    data.rebuild_rollups()
+    data.rebuild_stats()
+    data.rebuild_totals()
+    data.rebuild_fingerprints()
+
+
+def run(label, rows, append, seed_rows):
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        warm(directory, seed_rows)
+        start = time.perf_counter()
+        append(rows)
+        elapsed = time.perf_counter() - start
+        os.chdir(previous)
+    print(f"{label:<36} {len(rows) / elapsed:>12,.0f} rows/sec")
+
+
+# Rows in the ledger before appending, and rows timed for the slow per-row path.
+SEED_ROWS = 10_000
+PER_ROW_LIMIT = 10_000
+
+
+def per_row(rows):
+    for row in rows:
+        data.save_transaction(*row)
+
+
+def with_writer(fsync):
+    def append(rows):
+        with data.LedgerWriter(flush_every=1000, fsync=fsync) as writer:
+            for row in rows:
+                writer.write(*row)
+    return append
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    lines = synthetic_lines(count + SEED_ROWS)
+    seed_rows = [split_line(line) for line in lines[:SEED_ROWS]]
+    rows = [split_line(line) for line in lines[SEED_ROWS:]]
+    print(f"rows: {count:,}, appended to a {SEED_ROWS:,}-row ledger with its derived files")
+    run("save_transaction (per row)", rows[:PER_ROW_LIMIT], per_row, seed_rows)
+    run("save_transactions (bulk)", rows, data.save_transactions, seed_rows)
+    run("LedgerWriter, flush every 1000", rows, with_writer(fsync=False), seed_rows)
+    run("LedgerWriter, fsync every 1000", rows, with_writer(fsync=True), seed_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# benchmarks/bulk_import.py
+"""Measures bulk CSV import throughput, parsing in-process and in a process pool.
+
+The input is a synthetic file in the app's own transactions.csv export format.
+
+Run from the finance_tracker directory:
+    python -m benchmarks.bulk_import [rows] [workers]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.store_memory import synthetic_lines
+from features.data_management import bulk_import
+from features.transactions import data
+from features.transactions.reader import split_line
+
+
+def write_csv(path, rows):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("Date,Type,Category,Description,Amount\n")
+        for line in synthetic_lines(rows):
+            date, transaction_type, category, description, amount = split_line(line)
+            file.write(f"{date},{transaction_type},{category},{description},{amount / 100}\n")
+
+
+def parse(path, workers):
+    with open(path, "r", encoding="utf-8-sig", newline="") as file:
+        return bulk_import.parse_csv(file, workers)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else max(os.cpu_count() or 1, 2)
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        os.mkdir("database")
+        write_csv("transactions.csv", rows)
+        print(f"rows: {rows:,} ({os.path.getsize('transactions.csv') / 2**20:.1f} MiB), CPUs: {os.cpu_count()}")
+
+        for label, count in (("parse in-process", 1), (f"parse, {workers} workers", workers)):
+            start = time.perf_counter()
+            parsed = parse("transactions.csv", count)
+            elapsed = time.perf_counter() - start
+            assert len(parsed["records"]) == rows and not parsed["errors"]
+            print(f"{label:<24} {rows / elapsed:>12,.0f} rows/sec")
+
+        start = time.perf_counter()
+        data.save_transactions(parsed["records"], batch_rows=len(parsed["records"]))
+        elapsed = time.perf_counter() - start
+        print(f"{'one batched write':<24} {rows / elapsed:>12,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
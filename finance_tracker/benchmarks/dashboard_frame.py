@@ -0,0 +1,44 @@
+# benchmarks/dashboard_frame.py
+"""Compares building the dashboard DataFrame from row dicts with building it from the store's columns.
+
+Run from the finance_tracker directory:
+    python -m benchmarks.dashboard_frame [rows]
+"""
+import sys
+import time
+
+import pandas as pd
+
+from benchmarks.store_memory import load_store, synthetic_lines
+from features.dashboard.frames import store_to_frame
+
+
+def frame_from_dicts(store):
+    """The previous dashboard path: dicts, then a DataFrame, then separate amount and date passes."""
+    df = pd.DataFrame(store.to_dicts())
+    df["amount"] = df["amount"] / 100
+    df["date"] = pd.to_datetime(df["date"])
+    df["month_year"] = df["date"].dt.to_period("M").astype(str)
+    return df
+
+
+def measure(builder, store):
+    start = time.perf_counter()
+    df = builder(store)
+    elapsed = time.perf_counter() - start
+    return elapsed, df.memory_usage(deep=True).sum()
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    store = load_store(synthetic_lines(rows))
+    dict_time, dict_bytes = measure(frame_from_dicts, store)
+    column_time, column_bytes = measure(store_to_frame, store)
+    print(f"rows: {rows:,}")
+    print(f"from dicts:   {dict_time:6.2f} s, {dict_bytes / 2**20:7.1f} MiB")
+    print(f"from columns: {column_time:6.2f} s, {column_bytes / 2**20:7.1f} MiB")
+    print(f"speedup:      {dict_time / column_time:6.1f}x, {dict_bytes / column_bytes:.1f}x less memory")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# benchmarks/json_export.py
+"""Compares the old in-memory json.dump(indent=4) export with the streaming JSON and JSON Lines paths.
+
+Each path runs in its own process so its peak RSS is measured on its own; the
+growth column is the peak minus the RSS after loading the ledger.
+
+Run from the finance_tracker directory:
+    python -m benchmarks.json_export [rows]
+"""
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.store_memory import synthetic_lines
+from features.data_management import data_management
+from features.transactions import data
+
+
+def old_export(path):
+    """The previous export: every transaction as a dict, then one indented json.dump."""
+    payload = {
+        "transactions": data.get_transactions().to_dicts(),
+        "budgets": data.get_budgets(),
+        "goals": data.get_goals()
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(payload, file, indent=4)
+
+
+def ndjson_import(path):
+    data.TRANSACTIONS_FILE = os.path.join("database", "imported.txt")
+    data_management.import_from_ndjson(path)
+
+
+PATHS = {
+    "json.dump(indent=4)": (old_export, "old.json"),
+    "streaming JSON": (data_management.export_to_json, "financial_data.json"),
+    "JSON Lines": (data_management.export_to_ndjson, "transactions.ndjson"),
+    "JSON Lines import": (ndjson_import, "transactions.ndjson"),
+}
+
+
+def peak_rss_mib():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def child(label, directory):
+    os.chdir(directory)
+    data.get_transactions()
+    loaded = peak_rss_mib()
+    run, path = PATHS[label]
+    start = time.perf_counter()
+    run(path)
+    elapsed = time.perf_counter() - start
+    peak = peak_rss_mib()
+    print(json.dumps({"seconds": elapsed, "peak": peak, "growth": peak - loaded, "bytes": os.path.getsize(path)}))
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as directory:
+        os.mkdir(os.path.join(directory, "database"))
+        with open(os.path.join(directory, data.TRANSACTIONS_FILE), "w") as file:
+            file.writelines(synthetic_lines(rows))
+
+        print(f"rows: {rows:,}")
+        for label in PATHS:
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.json_export", "--child", label, directory],
+                check=True, capture_output=True, text=True, cwd=os.getcwd(),
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            print(
+                f"{label:<20} {result['seconds']:6.2f} s, peak RSS {result['peak']:7.1f} MiB "
+                f"(+{result['growth']:6.1f} MiB), file {result['bytes'] / 2**20:6.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3])
+    else:
+        main()
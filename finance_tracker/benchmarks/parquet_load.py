@@ -0,0 +1,51 @@
+# benchmarks/parquet_load.py
+"""Compares opening the ledger by parsing the text file with loading a Parquet snapshot.
+
+Run from the finance_tracker directory:
+    python -m benchmarks.parquet_load [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.store_memory import synthetic_lines
+from features.transactions import data, parquet
+
+
+def timed(load):
+    start = time.perf_counter()
+    store = load()
+    return time.perf_counter() - start, store
+
+
+def parse_ledger():
+    data._cache["key"] = None
+    return data.get_transactions()
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    with tempfile.TemporaryDirectory() as directory:
+        data.TRANSACTIONS_FILE = os.path.join(directory, "transactions.txt")
+        path = os.path.join(directory, "transactions.parquet")
+        with open(data.TRANSACTIONS_FILE, "w") as file:
+            file.writelines(synthetic_lines(rows))
+
+        parse_time, store = timed(parse_ledger)
+        write_time, _ = timed(lambda: parquet.write(store, path))
+        full_time, loaded = timed(lambda: parquet.read_store(path))
+        projected_time, _ = timed(lambda: parquet.read_store(path, descriptions=False))
+        assert loaded.to_dicts()[-10:] == store.to_dicts()[-10:]
+
+        print(f"rows: {rows:,}")
+        print(f"ledger file:               {os.path.getsize(data.TRANSACTIONS_FILE) / 2**20:6.1f} MiB")
+        print(f"snapshot file:             {os.path.getsize(path) / 2**20:6.1f} MiB")
+        print(f"parse text ledger:         {parse_time:6.2f} s")
+        print(f"write snapshot:            {write_time:6.2f} s")
+        print(f"load snapshot:             {full_time:6.2f} s ({parse_time / full_time:.0f}x faster)")
+        print(f"load without descriptions: {projected_time:6.2f} s ({parse_time / projected_time:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/store_memory.py
+"""Compares memory per row of the old list-of-dicts ledger with TransactionStore.
+
+Run from the finance_tracker directory:
+    python -m benchmarks.store_memory [rows]
+"""
+import random
+import sys
+import tracemalloc
+from datetime import date, timedelta
+
+from features.transactions.store import TransactionStore
+
+EXPENSE_CATEGORIES = ["Food", "Transport", "Shopping", "Bills", "Entertainment", "Health", "Other"]
+INCOME_CATEGORIES = ["Salary", "Freelance", "Business", "Investment", "Gift", "Other"]
+
+
+def synthetic_lines(rows, seed=42):
+    """Generates ledger lines in the transactions.txt format."""
+    rng = random.Random(seed)
+    start = date(2020, 1, 1)
+    lines = []
+    for i in range(rows):
+        day = (start + timedelta(days=i * 2000 // rows)).isoformat()
+        if rng.random() < 0.1:
+            lines.append(f"{day},Income,{rng.choice(INCOME_CATEGORIES)},Payment {i},{rng.randint(10000, 5000000)}\n")
+        else:
+            lines.append(f"{day},Expense,{rng.choice(EXPENSE_CATEGORIES)},Purchase {i},{rng.randint(100, 500000)}\n")
+    return lines
+
+
+def load_dicts(lines):
+    """The pre-columnar parser: one dict per row."""
+    transactions = []
+    for line in lines:
+        date_str, transaction_type, category, description, amount = line.strip().split(",")
+        transactions.append({
+            "date": date_str,
+            "type": transaction_type,
+            "category": category,
+            "description": description,
+            "amount": int(amount)
+        })
+    return transactions
+
+
+def load_store(lines):
+    store = TransactionStore()
+    for line in lines:
+        date_str, transaction_type, category, description, amount = line.strip().split(",")
+        store.append(date_str, transaction_type, category, description, int(amount))
+    return store
+
+
+def measure(loader, lines):
+    tracemalloc.start()
+    result = loader(lines)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    lines = synthetic_lines(rows)
+    dict_bytes = measure(load_dicts, lines)
+    store_bytes = measure(load_store, lines)
+    print(f"rows: {rows:,}")
+    print(f"list of dicts:    {dict_bytes / rows:8.1f} bytes/row ({dict_bytes / 2**20:8.1f} MiB)")
+    print(f"TransactionStore: {store_bytes / rows:8.1f} bytes/row ({store_bytes / 2**20:8.1f} MiB)")
+    print(f"reduction:        {dict_bytes / store_bytes:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
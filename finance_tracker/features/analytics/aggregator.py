@@ -0,0 +1,138 @@
+# features/analytics/aggregator.py
+import heapq
+from features.analytics import numpy_backend
+from features.transactions.data import (
+    get_category_totals, get_transaction_columns, get_transactions, iter_transactions, query
+)
+from features.transactions.store import FIELDS, month_index
+
+KINDS = ("sum", "count", "max", "top_k")
+
+
+class Aggregate:
+    """One named metric of a report: a sum, count, max or top-k over matching transactions.
+
+    month, transaction_type and category restrict the rows considered. group_by
+    ("category" or "month") turns a sum or count into a {group: value} dict,
+    and k is the number of rows kept by top_k.
+    """
+
+    __slots__ = ("kind", "month", "month_index", "transaction_type", "category", "group_by", "k")
+
+    def __init__(self, kind, month=None, transaction_type=None, category=None, group_by=None, k=5):
+        if kind not in KINDS:
+            raise ValueError(f"Unknown aggregate kind: {kind}")
+        self.kind = kind
+        self.month = month
+        self.month_index = None if month is None else month_index(month)
+        self.transaction_type = transaction_type
+        self.category = category
+        self.group_by = group_by
+        self.k = k
+
+    def from_rollup(self):
+        """Returns True if the monthly rollup already holds this metric."""
+        return (
+            self.kind == "sum"
+            and self.month is not None
+            and self.transaction_type is not None
+            and self.group_by in (None, "category")
+        )
+
+    def from_month_index(self):
+        """Returns True if this is a top-k within one month, answered from the day index."""
+        return self.kind == "top_k" and self.month is not None and self.group_by is None
+
+    def matches(self, row_month, transaction_type, category):
+        return (
+            (self.month_index is None or row_month == self.month_index)
+            and (self.transaction_type is None or transaction_type == self.transaction_type)
+            and (self.category is None or category == self.category)
+        )
+
+
+def _rollup_value(spec):
+    totals = get_category_totals(spec.month, spec.transaction_type)
+    if spec.category is not None:
+        totals = {spec.category: totals[spec.category]} if spec.category in totals else {}
+    if spec.group_by == "category":
+        return totals
+    return sum(totals.values())
+
+def _top_in_month(spec):
+    rows = query(spec.transaction_type, category=spec.category, month=spec.month,
+                 order_by="amount", descending=True, limit=spec.k)
+    return [dict(row) for row in rows]
+
+def _initial(spec):
+    if spec.kind == "top_k":
+        return []
+    if spec.group_by is not None:
+        return {}
+    return None if spec.kind == "max" else 0
+
+def _finish(spec, value):
+    if spec.kind == "top_k":
+        # Largest first; among equal amounts the earlier transaction wins, as with a stable sort.
+        return [dict(zip(FIELDS, record)) for _, _, record in sorted(value, key=lambda item: (-item[0], -item[1]))]
+    return value
+
+def scan(specs, records):
+    """Computes every spec in {name: Aggregate} in a single pass over records."""
+    results = {name: _initial(spec) for name, spec in specs.items()}
+
+    for position, record in enumerate(records):
+        date, transaction_type, category, _, amount = record
+        row_month = month_index(date)
+        for name, spec in specs.items():
+            if not spec.matches(row_month, transaction_type, category):
+                continue
+            kind = spec.kind
+            if kind == "top_k":
+                entry = (amount, -position, record)
+                if len(results[name]) < spec.k:
+                    heapq.heappush(results[name], entry)
+                elif entry > results[name][0]:
+                    heapq.heapreplace(results[name], entry)
+                continue
+            value = 1 if kind == "count" else amount
+            if spec.group_by is not None:
+                group = date[:7] if spec.group_by == "month" else category
+                groups = results[name]
+                if kind == "max":
+                    groups[group] = value if group not in groups else max(groups[group], value)
+                else:
+                    groups[group] = groups.get(group, 0) + value
+            elif kind == "max":
+                results[name] = value if results[name] is None else max(results[name], value)
+            else:
+                results[name] += value
+
+    return {name: _finish(specs[name], value) for name, value in results.items()}
+
+def run_aggregates(specs):
+    """Computes a report's metrics, given as {name: Aggregate}, and returns {name: value}.
+
+    Month/type/category sums are read straight from the monthly rollup, and
+    top-k lists within a month come from a bounded heap over only that month's
+    rows. All remaining metrics are computed together over the loaded ledger
+    or a current Parquet snapshot if there is one: with vectorized masks when
+    NumPy is installed, otherwise in one pass, streaming only the months they
+    need from the ledger when neither is loaded.
+    """
+    results = {name: _rollup_value(spec) for name, spec in specs.items() if spec.from_rollup()}
+    results.update((name, _top_in_month(spec)) for name, spec in specs.items() if spec.from_month_index())
+    remaining = {name: spec for name, spec in specs.items() if name not in results}
+    if not remaining:
+        return results
+
+    months = {spec.month for spec in remaining.values()}
+    if None in months:
+        months = None
+    # Only top-k lists need descriptions, so the snapshot can skip that column.
+    store = get_transaction_columns(descriptions=any(spec.kind == "top_k" for spec in remaining.values()))
+    if numpy_backend.available():
+        results.update(numpy_backend.scan(remaining, get_transactions(months) if store is None else store))
+    else:
+        results.update(scan(remaining, iter_transactions(months) if store is None else store.records()))
+    return results
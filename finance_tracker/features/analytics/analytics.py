@@ -3,47 +3,13 @@ from rich.table import Table
 from rich.panel import Panel
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
+from features.analytics.aggregator import Aggregate, run_aggregates
+from features.budgets.evaluator import evaluate_budgets
+from features.transactions.data import get_budgets, has_transactions
 
 # Create a console object
 console = Console()
 
-TRANSACTIONS_FILE = "database/transactions.txt"
-BUDGETS_FILE = "database/budgets.txt"
-
-def get_transactions():
-    """Reads all transactions from the transactions file."""
-    try:
-        with open(TRANSACTIONS_FILE, "r") as file:
-            lines = file.readlines()
-        
-        transactions = []
-        for line in lines:
-            date, transaction_type, category, description, amount = line.strip().split(",")
-            transactions.append({
-                "date": date,
-                "type": transaction_type,
-                "category": category,
-                "description": description,
-                "amount": int(amount)
-            })
-        return transactions
-    except FileNotFoundError:
-        return []
-
-def get_budgets():
-    """Reads all budgets from the budgets file."""
-    try:
-        with open(BUDGETS_FILE, "r") as file:
-            lines = file.readlines()
-        
-        budgets = {}
-        for line in lines:
-            category, amount = line.strip().split(",")
-            budgets[category] = int(amount)
-        return budgets
-    except FileNotFoundError:
-        return {}
-        
 def display_pie_chart(category_spending, total_spending):
     """Displays an ASCII pie chart of spending by category."""
     console.print("\n[bold blue]Spending by Category (ASCII Pie Chart):[/bold blue]")
@@ -57,25 +23,25 @@ def display_pie_chart(category_spending, total_spending):
 def spending_analysis():
     """Analyzes spending patterns."""
     console.print("[bold blue]Spending Analysis[/bold blue]")
-    transactions = get_transactions()
 
-    if not transactions:
+    if not has_transactions():
         console.print("[bold yellow]No transactions found.[/bold yellow]")
         return
 
     now = datetime.now()
     current_month_str = now.strftime("%Y-%m")
+    last_month = now - relativedelta(months=1)
+    last_month_str = last_month.strftime("%Y-%m")
     
+    results = run_aggregates({
+        "category_spending": Aggregate("sum", month=current_month_str, transaction_type="Expense", group_by="category"),
+        "last_month": Aggregate("sum", month=last_month_str, transaction_type="Expense"),
+    })
+
     # Category Breakdown
-    category_spending = {}
-    total_spending_current_month = 0
-    
-    for t in transactions:
-        if t["type"] == "Expense" and t["date"].startswith(current_month_str):
-            category = t["category"]
-            amount = t["amount"]
-            category_spending[category] = category_spending.get(category, 0) + amount
-            total_spending_current_month += amount
+    category_spending = results["category_spending"]
+    total_spending_current_month = sum(category_spending.values())
+    total_spending_last_month = results["last_month"]
 
     if total_spending_current_month == 0:
         console.print("[bold yellow]No expenses found for the current month.[/bold yellow]")
@@ -111,14 +77,6 @@ def spending_analysis():
         console.print(f"\n[bold blue]Average Daily Expense:[/bold blue] {average_daily_expense / 100:.2f}")
 
     # Monthly Comparison
-    last_month = now - relativedelta(months=1)
-    last_month_str = last_month.strftime("%Y-%m")
-    
-    total_spending_last_month = 0
-    for t in transactions:
-        if t["type"] == "Expense" and t["date"].startswith(last_month_str):
-            total_spending_last_month += t["amount"]
-            
     console.print(f"\n[bold blue]Monthly Comparison:[/bold blue]")
     console.print(f"Total spending this month: {total_spending_current_month / 100:.2f}")
     console.print(f"Total spending last month: {total_spending_last_month / 100:.2f}")
@@ -136,26 +94,25 @@ def spending_analysis():
 def income_analysis():
     """Analyzes income patterns."""
     console.print("[bold blue]Income Analysis[/bold blue]")
-    transactions = get_transactions()
 
-    if not transactions:
+    if not has_transactions():
         console.print("[bold yellow]No transactions found.[/bold yellow]")
         return
 
     now = datetime.now()
     current_month_str = now.strftime("%Y-%m")
+    last_month = now - relativedelta(months=1)
+    last_month_str = last_month.strftime("%Y-%m")
+
+    results = run_aggregates({
+        "income_sources": Aggregate("sum", month=current_month_str, transaction_type="Income", group_by="category"),
+        "last_month": Aggregate("sum", month=last_month_str, transaction_type="Income"),
+    })
 
     # Income by source
-    income_sources = {}
-    total_income_current_month = 0
-
-    for t in transactions:
-        if t["type"] == "Income" and t["date"].startswith(current_month_str):
-            source = t["category"]
-            amount = t["amount"]
-            income_sources[source] = income_sources.get(source, 0) + amount
-            total_income_current_month += amount
-    
+    income_sources = results["income_sources"]
+    total_income_current_month = sum(income_sources.values())
+
     if total_income_current_month == 0:
         console.print("[bold yellow]No income found for the current month.[/bold yellow]")
     else:
@@ -178,14 +135,8 @@ def income_analysis():
 
 
     # Monthly Comparison
-    last_month = now - relativedelta(months=1)
-    last_month_str = last_month.strftime("%Y-%m")
-    
-    total_income_last_month = 0
-    for t in transactions:
-        if t["type"] == "Income" and t["date"].startswith(last_month_str):
-            total_income_last_month += t["amount"]
-    
+    total_income_last_month = results["last_month"]
+
     console.print(f"\n[bold blue]Monthly Comparison:[/bold blue]")
     console.print(f"Total income this month: {total_income_current_month / 100:.2f}")
     console.print(f"Total income last month: {total_income_last_month / 100:.2f}")
@@ -207,18 +158,24 @@ def income_analysis():
 def savings_analysis():
     """Analyzes savings patterns."""
     console.print("[bold blue]Savings Analysis[/bold blue]")
-    transactions = get_transactions()
 
-    if not transactions:
+    if not has_transactions():
         console.print("[bold yellow]No transactions found.[/bold yellow]")
         return
 
     now = datetime.now()
+    trend_months = [(now - relativedelta(months=i)).strftime("%Y-%m") for i in range(3)]
+
+    specs = {}
+    for month_str in trend_months:
+        specs[f"income {month_str}"] = Aggregate("sum", month=month_str, transaction_type="Income")
+        specs[f"expenses {month_str}"] = Aggregate("sum", month=month_str, transaction_type="Expense")
+    results = run_aggregates(specs)
     
     # Current Month Savings
-    current_month_str = now.strftime("%Y-%m")
-    total_income_current_month = sum(t["amount"] for t in transactions if t["type"] == "Income" and t["date"].startswith(current_month_str))
-    total_spending_current_month = sum(t["amount"] for t in transactions if t["type"] == "Expense" and t["date"].startswith(current_month_str))
+    current_month_str = trend_months[0]
+    total_income_current_month = results[f"income {current_month_str}"]
+    total_spending_current_month = results[f"expenses {current_month_str}"]
     savings_current_month = total_income_current_month - total_spending_current_month
     savings_rate = (savings_current_month / total_income_current_month) * 100 if total_income_current_month > 0 else 0
     
@@ -230,12 +187,9 @@ def savings_analysis():
     
     # Savings Trend (last 3 months)
     console.print("\n[bold blue]Savings Trend (Last 3 Months):[/bold blue]")
-    for i in range(3):
-        month = now - relativedelta(months=i)
-        month_str = month.strftime("%Y-%m")
-        
-        income = sum(t["amount"] for t in transactions if t["type"] == "Income" and t["date"].startswith(month_str))
-        expenses = sum(t["amount"] for t in transactions if t["type"] == "Expense" and t["date"].startswith(month_str))
+    for month_str in trend_months:
+        income = results[f"income {month_str}"]
+        expenses = results[f"expenses {month_str}"]
         savings = income - expenses
         
         console.print(f"{month_str}: {savings / 100:.2f}")
@@ -244,19 +198,23 @@ def financial_health_score():
     """Calculates and displays a financial health score."""
     console.print("[bold blue]Financial Health Score[/bold blue]")
     
-    transactions = get_transactions()
     budgets = get_budgets()
     
-    if not transactions:
+    if not has_transactions():
         console.print("[bold yellow]No transactions found.[/bold yellow]")
         return
         
     now = datetime.now()
     current_month_str = now.strftime("%Y-%m")
     
+    results = run_aggregates({
+        "income": Aggregate("sum", month=current_month_str, transaction_type="Income"),
+        "expenses": Aggregate("sum", month=current_month_str, transaction_type="Expense"),
+    })
+
     # 1. Savings Rate Score (30 points)
-    total_income = sum(t["amount"] for t in transactions if t["type"] == "Income" and t["date"].startswith(current_month_str))
-    total_expenses = sum(t["amount"] for t in transactions if t["type"] == "Expense" and t["date"].startswith(current_month_str))
+    total_income = results["income"]
+    total_expenses = results["expenses"]
     savings = total_income - total_expenses
     savings_rate = (savings / total_income) * 100 if total_income > 0 else 0
     
@@ -313,25 +271,30 @@ def generate_monthly_report():
     """Generates a comprehensive monthly report."""
     console.print("[bold blue]Generating Monthly Report...[/bold blue]")
     
-    transactions = get_transactions()
-    budgets = get_budgets()
-    
-    if not transactions:
+    if not has_transactions():
         console.print("[bold yellow]No transactions found.[/bold yellow]")
         return
         
     now = datetime.now()
     current_month_str = now.strftime("%Y-%m")
     
-    # Data gathering
-    total_income = sum(t["amount"] for t in transactions if t["type"] == "Income" and t["date"].startswith(current_month_str))
-    total_expenses = sum(t["amount"] for t in transactions if t["type"] == "Expense" and t["date"].startswith(current_month_str))
-    savings = total_income - total_expenses
-    
     last_month = now - relativedelta(months=1)
     last_month_str = last_month.strftime("%Y-%m")
-    total_income_last_month = sum(t["amount"] for t in transactions if t["type"] == "Income" and t["date"].startswith(last_month_str))
-    total_expenses_last_month = sum(t["amount"] for t in transactions if t["type"] == "Expense" and t["date"].startswith(last_month_str))
+
+    # Data gathering
+    results = run_aggregates({
+        "income": Aggregate("sum", month=current_month_str, transaction_type="Income"),
+        "category_spending": Aggregate("sum", month=current_month_str, transaction_type="Expense", group_by="category"),
+        "income_last_month": Aggregate("sum", month=last_month_str, transaction_type="Income"),
+        "expenses_last_month": Aggregate("sum", month=last_month_str, transaction_type="Expense"),
+        "top_transactions": Aggregate("top_k", month=current_month_str, k=5),
+    })
+    category_spending = results["category_spending"]
+    total_income = results["income"]
+    total_expenses = sum(category_spending.values())
+    savings = total_income - total_expenses
+    total_income_last_month = results["income_last_month"]
+    total_expenses_last_month = results["expenses_last_month"]
 
     # Report sections
     report = f"[bold green]Monthly Financial Report for {current_month_str}[/bold green]\n\n"
@@ -349,16 +312,15 @@ def generate_monthly_report():
     report += f"- This month: {total_expenses / 100:.2f}\n"
     report += f"- Last month: {total_expenses_last_month / 100:.2f}\n\n"
     
-    if budgets:
+    budget_evaluation = evaluate_budgets(current_month_str)
+    if budget_evaluation:
         report += "[bold]Budget Performance:[/bold]\n"
-        for category, budget_amount in budgets.items():
-            spent = sum(t["amount"] for t in transactions if t["type"] == "Expense" and t["category"] == category and t["date"].startswith(current_month_str))
-            report += f"- {category}: Spent {spent/100:.2f} of {budget_amount/100:.2f}\n"
+        for category, result in budget_evaluation.items():
+            report += f"- {category}: Spent {result['spent']/100:.2f} of {result['budget']/100:.2f}\n"
         report += "\n"
 
     report += "[bold]Top Transactions (Current Month):[/bold]\n"
-    top_transactions = sorted([t for t in transactions if t["date"].startswith(current_month_str)], key=lambda t: t["amount"], reverse=True)[:5]
-    for t in top_transactions:
+    for t in results["top_transactions"]:
         report += f"- {t['date']}: {t['description']} ({t['category']}) - {t['amount']/100:.2f}\n"
     report += "\n"
     
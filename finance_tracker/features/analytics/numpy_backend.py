@@ -0,0 +1,136 @@
+# features/analytics/numpy_backend.py
+"""Vectorized evaluation of analytics aggregates with NumPy.
+
+Used automatically when NumPy is installed for every aggregate the monthly
+rollup and the day index cannot answer, income stability and the
+dashboard's totals; each caller falls back to pure Python otherwise.
+Results are identical either way.
+"""
+from features.transactions.store import month_index
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# date.toordinal() of 1970-01-01, the NumPy datetime64 epoch.
+EPOCH_ORDINAL = 719163
+
+# The arrays of the last store scanned; the store is shared and only grows.
+_arrays = {"arrays": None}
+
+
+def available():
+    """Returns True if NumPy can be imported."""
+    return np is not None
+
+
+class LedgerArrays:
+    """Typed NumPy arrays of a TransactionStore's columns.
+
+    dates are datetime64[D], months are months since 1970-01, cents are int64,
+    and types and categories are small-int codes into the store's lists.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.rows = len(store)
+        ordinals = np.frombuffer(store.dates, dtype=np.int32) if len(store) else np.zeros(0, dtype=np.int32)
+        self.dates = (ordinals.astype(np.int64) - EPOCH_ORDINAL).astype("datetime64[D]")
+        self.months = self.dates.astype("datetime64[M]").astype(np.int64)
+        # Copies, not views: a store column exporting its buffer could not grow.
+        self.cents = np.array(store.amounts, dtype=np.int64)
+        self.type_codes = np.array(store.type_codes, dtype=np.int64)
+        self.category_codes = np.array(store.category_codes, dtype=np.int64)
+
+    def mask(self, month=None, transaction_type=None, category=None, start=None, end=None):
+        """Returns a boolean mask of the rows matching every given predicate.
+
+        start and end are inclusive day ordinals.
+        """
+        mask = np.ones(len(self.cents), dtype=bool)
+        if month is not None:
+            mask &= self.months == month_index(month)
+        if start is not None:
+            mask &= self.dates >= np.datetime64(start - EPOCH_ORDINAL, "D")
+        if end is not None:
+            mask &= self.dates <= np.datetime64(end - EPOCH_ORDINAL, "D")
+        if transaction_type is not None:
+            code = self.store.type_code(transaction_type)
+            mask &= self.type_codes == (-1 if code is None else code)
+        if category is not None:
+            code = self.store.category_code(category)
+            mask &= self.category_codes == (-1 if code is None else code)
+        return mask
+
+
+def _by_category(arrays, mask, values, reduce_max=False):
+    """Groups values by category, keeping categories in order of first appearance."""
+    codes = arrays.category_codes[mask]
+    if not len(codes):
+        return {}
+    present, first_seen = np.unique(codes, return_index=True)
+    if reduce_max:
+        totals = np.full(len(arrays.store.categories), np.iinfo(np.int64).min, dtype=np.int64)
+        np.maximum.at(totals, codes, values)
+    else:
+        totals = np.bincount(codes, weights=values, minlength=len(arrays.store.categories))
+    ordered = present[np.argsort(first_seen)]
+    return {arrays.store.categories[code]: int(totals[code]) for code in ordered}
+
+def _by_month(arrays, mask, values, reduce_max=False):
+    """Groups values by YYYY-MM month using a sort and add.reduceat over month boundaries."""
+    months = arrays.months[mask]
+    if not len(months):
+        return {}
+    order = np.argsort(months, kind="stable")
+    months, values = months[order], values[order]
+    starts = np.flatnonzero(np.r_[True, months[1:] != months[:-1]])
+    reducer = np.maximum if reduce_max else np.add
+    totals = reducer.reduceat(values, starts)
+    labels = np.datetime_as_string(months[starts].astype("datetime64[M]"))
+    return {str(label): int(total) for label, total in zip(labels, totals)}
+
+def _evaluate(arrays, spec):
+    mask = arrays.mask(spec.month, spec.transaction_type, spec.category)
+
+    if spec.kind == "top_k":
+        rows = np.flatnonzero(mask)
+        # Largest amounts first; ties keep ledger order, like a stable sort.
+        order = np.lexsort((rows, -arrays.cents[rows]))[:spec.k]
+        return [dict(arrays.store[int(row)]) for row in rows[order]]
+
+    values = np.ones(int(mask.sum()), dtype=np.int64) if spec.kind == "count" else arrays.cents[mask]
+    reduce_max = spec.kind == "max"
+    if spec.group_by == "category":
+        return _by_category(arrays, mask, values, reduce_max)
+    if spec.group_by == "month":
+        return _by_month(arrays, mask, values, reduce_max)
+    if reduce_max:
+        return int(values.max()) if len(values) else None
+    return int(values.sum())
+
+def ledger_arrays(store):
+    """Returns the LedgerArrays of a store, reused until the store is replaced or grows."""
+    arrays = _arrays["arrays"]
+    if arrays is None or arrays.store is not store or arrays.rows != len(store):
+        arrays = LedgerArrays(store)
+        _arrays["arrays"] = arrays
+    return arrays
+
+def scan(specs, store):
+    """Computes every spec in {name: Aggregate} over a TransactionStore with vectorized masks."""
+    arrays = ledger_arrays(store)
+    return {name: _evaluate(arrays, spec) for name, spec in specs.items()}
+
+def totals_by_month(store, transaction_type, start=None, end=None):
+    """Returns {YYYY-MM: cents} of one type, optionally between two inclusive day ordinals; empty months are left out."""
+    arrays = ledger_arrays(store)
+    mask = arrays.mask(transaction_type=transaction_type, start=start, end=end)
+    return _by_month(arrays, mask, arrays.cents[mask])
+
+def totals_by_category(store, month, transaction_type):
+    """Returns {category: cents} of one type in a YYYY-MM month, in order of first appearance."""
+    arrays = ledger_arrays(store)
+    mask = arrays.mask(month, transaction_type)
+    return _by_category(arrays, mask, arrays.cents[mask])
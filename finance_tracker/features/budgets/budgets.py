@@ -1,52 +1,7 @@
 import streamlit as st
 import pandas as pd
-from datetime import datetime
-
-# Define the path to the budgets file
-BUDGETS_FILE = "database/budgets.txt"
-TRANSACTIONS_FILE = "database/transactions.txt"
-
-def get_budgets():
-    """Reads all budgets from the budgets file."""
-    try:
-        with open(BUDGETS_FILE, "r") as file:
-            lines = file.readlines()
-        
-        budgets = {}
-        for line in lines:
-            category, amount = line.strip().split(",")
-            budgets[category] = int(amount)
-        return budgets
-    except FileNotFoundError:
-        return {}
-
-def get_transactions():
-    """Reads all transactions from the transactions file."""
-    try:
-        with open(TRANSACTIONS_FILE, "r") as file:
-            lines = file.readlines()
-        
-        transactions = []
-        for line in lines:
-            date, transaction_type, category, description, amount = line.strip().split(",")
-            transactions.append({
-                "date": date,
-                "type": transaction_type,
-                "category": category,
-                "description": description,
-                "amount": int(amount)
-            })
-        return transactions
-    except FileNotFoundError:
-        return []
-
-def save_budget(category, amount):
-    """Saves a budget to the budgets file."""
-    budgets = get_budgets()
-    budgets[category] = amount
-    with open(BUDGETS_FILE, "w") as file:
-        for category, amount in budgets.items():
-            file.write(f"{category},{amount}\n")
+from features.budgets.evaluator import evaluate_budgets
+from features.transactions.data import save_budget
 
 
 def set_budget():
@@ -77,43 +32,24 @@ def set_budget():
 
 def view_budgets():
     """Displays the budget vs actual spending."""
-    budgets = get_budgets()
-    transactions = get_transactions()
+    evaluation = evaluate_budgets()
 
-    if not budgets:
+    if not evaluation:
         st.warning("⚠️ No budgets set. Please set a budget first.")
         return
 
     st.subheader("📊 Budget vs Spending")
 
-    current_month = datetime.now().strftime("%Y-%m")
-
+    status_labels = {"OK": "✅ OK", "Warning": "⚠️ Warning", "Over": "🔴 Over"}
     budget_data = []
-    for category, budget_amount in budgets.items():
-        spent_amount = sum(
-            t["amount"] for t in transactions
-            if t["type"] == "Expense" 
-            and t["category"] == category
-            and t["date"].startswith(current_month)
-        )
-        
-        remaining_amount = budget_amount - spent_amount
-        utilization = (spent_amount / budget_amount) * 100 if budget_amount > 0 else 0
-
-        if utilization < 70:
-            status = "✅ OK"
-        elif 70 <= utilization <= 100:
-            status = "⚠️ Warning"
-        else:
-            status = "🔴 Over"
-
+    for category, result in evaluation.items():
         budget_data.append({
             "Category": category,
-            "Budget": f"${budget_amount / 100:.2f}",
-            "Spent": f"${spent_amount / 100:.2f}",
-            "Remaining": f"${remaining_amount / 100:.2f}",
-            "Utilization (%)": f"{utilization:.1f}%",
-            "Status": status
+            "Budget": f"${result['budget'] / 100:.2f}",
+            "Spent": f"${result['spent'] / 100:.2f}",
+            "Remaining": f"${result['remaining'] / 100:.2f}",
+            "Utilization (%)": f"{result['utilization']:.1f}%",
+            "Status": status_labels[result["status"]]
         })
 
     df = pd.DataFrame(budget_data)
@@ -121,14 +57,8 @@ def view_budgets():
 
     # Add progress bars for each category
     st.subheader("Budget Utilization")
-    for category, budget_amount in budgets.items():
-        spent_amount = sum(
-            t["amount"] for t in transactions
-            if t["type"] == "Expense" 
-            and t["category"] == category
-            and t["date"].startswith(current_month)
-        )
-        utilization = (spent_amount / budget_amount) * 100 if budget_amount > 0 else 0
+    for category, result in evaluation.items():
+        utilization = result["utilization"]
         
         col1, col2 = st.columns([3, 1])
         with col1:
@@ -140,29 +70,17 @@ def view_budgets():
 
 def budget_summary():
     """Displays a summary of all budgets."""
-    budgets = get_budgets()
-    transactions = get_transactions()
+    evaluation = evaluate_budgets()
 
-    if not budgets:
+    if not evaluation:
         st.warning("⚠️ No budgets set. Please set a budget first.")
         return
 
-    total_budget = sum(budgets.values())
-    total_spent = 0
-    over_budget_categories = []
-
-    current_month = datetime.now().strftime("%Y-%m")
-
-    for category, budget_amount in budgets.items():
-        spent_amount = sum(
-            t["amount"] for t in transactions
-            if t["type"] == "Expense"
-            and t["category"] == category
-            and t["date"].startswith(current_month)
-        )
-        total_spent += spent_amount
-        if spent_amount > budget_amount:
-            over_budget_categories.append(category)
+    total_budget = sum(result["budget"] for result in evaluation.values())
+    total_spent = sum(result["spent"] for result in evaluation.values())
+    over_budget_categories = [
+        category for category, result in evaluation.items() if result["spent"] > result["budget"]
+    ]
 
     total_remaining = total_budget - total_spent
     overall_utilization = (total_spent / total_budget) * 100 if total_budget > 0 else 0
@@ -0,0 +1,52 @@
+# features/budgets/evaluator.py
+from datetime import datetime
+from features.transactions.data import get_budgets, get_category_totals, ledger_version
+
+# Utilization (%) at which a budget moves from "OK" to "Warning", and above which it is "Over".
+WARNING_UTILIZATION = 70
+OVER_UTILIZATION = 100
+
+# Evaluations of the current ledger version, keyed by (month, budgets).
+_memo = {"version": None, "results": {}}
+
+def budget_status(utilization):
+    """Returns "OK", "Warning" or "Over" for a utilization percentage."""
+    if utilization < WARNING_UTILIZATION:
+        return "OK"
+    if utilization <= OVER_UTILIZATION:
+        return "Warning"
+    return "Over"
+
+def evaluate_budgets(month=None):
+    """Evaluates every budget against its category's spending in a YYYY-MM month (default: this month).
+
+    Returns {category: {"budget", "spent", "remaining", "utilization", "status"}}
+    in budget order, with amounts in cents and utilization in percent. Spending
+    comes from one grouped lookup, and results are memoized until the ledger or
+    the budgets change, so they must not be modified.
+    """
+    if month is None:
+        month = datetime.now().strftime("%Y-%m")
+    budgets = get_budgets()
+
+    version = ledger_version()
+    if _memo["version"] != version:
+        _memo["version"], _memo["results"] = version, {}
+    key = (month, tuple(budgets.items()))
+    if key in _memo["results"]:
+        return _memo["results"][key]
+
+    category_spending = get_category_totals(month, "Expense")
+    evaluation = {}
+    for category, budget_amount in budgets.items():
+        spent_amount = category_spending.get(category, 0)
+        utilization = (spent_amount / budget_amount) * 100 if budget_amount > 0 else 0
+        evaluation[category] = {
+            "budget": budget_amount,
+            "spent": spent_amount,
+            "remaining": budget_amount - spent_amount,
+            "utilization": utilization,
+            "status": budget_status(utilization),
+        }
+    _memo["results"][key] = evaluation
+    return evaluation
@@ -0,0 +1,81 @@
+# features/dashboard/frames.py
+"""Builds pandas DataFrames straight from a TransactionStore's columns, and the small frames the dashboard charts."""
+import numpy as np
+import pandas as pd
+from features.analytics import numpy_backend
+from features.analytics.numpy_backend import EPOCH_ORDINAL
+
+COLUMNS = ["date", "type", "category", "description", "amount", "cents", "month_year"]
+
+# Columns shown in the dashboard's recent transactions table.
+DISPLAY_COLUMNS = ["date", "type", "category", "description", "amount", "month_year"]
+
+
+def _categorical(codes, values):
+    # Sorted categories so groupby output comes out in the same order as with plain strings.
+    return pd.Categorical.from_codes(codes, categories=values).reorder_categories(sorted(values))
+
+
+def store_to_frame(store):
+    """Returns a TransactionStore as a DataFrame without materializing a dict per row.
+
+    date is datetime64[ns], type, category and month_year are categoricals over
+    the store's interned values, cents is int64 and amount is cents / 100.
+    """
+    if len(store):
+        ordinals = np.frombuffer(store.dates, dtype=np.int32)
+        type_codes = np.frombuffer(store.type_codes, dtype=np.uint8)
+        category_codes = np.frombuffer(store.category_codes, dtype=np.uint16)
+        cents = np.frombuffer(store.amounts, dtype=np.int64)
+    else:
+        ordinals = np.zeros(0, dtype=np.int32)
+        type_codes = np.zeros(0, dtype=np.uint8)
+        category_codes = np.zeros(0, dtype=np.uint16)
+        cents = np.zeros(0, dtype=np.int64)
+
+    days = (ordinals.astype(np.int64) - EPOCH_ORDINAL).astype("datetime64[D]")
+    months, month_codes = np.unique(days.astype("datetime64[M]"), return_inverse=True)
+
+    return pd.DataFrame({
+        "date": days.astype("datetime64[ns]"),
+        "type": _categorical(type_codes, store.types),
+        "category": _categorical(category_codes, store.categories),
+        "description": store.descriptions(),
+        "amount": cents / 100,
+        "cents": cents.copy(),
+        "month_year": pd.Categorical.from_codes(month_codes.reshape(-1), categories=np.datetime_as_string(months)),
+    }, columns=COLUMNS)
+
+
+def month_overview(store, month):
+    """Returns the income and expense totals of a YYYY-MM month and its expenses by category.
+
+    Computed with NumPy masks over the store's columns, so no DataFrame of the
+    ledger is needed. Amounts are in currency units; the category frame has
+    category and amount columns, sorted by category.
+    """
+    income = numpy_backend.totals_by_category(store, month, "Income")
+    expenses = numpy_backend.totals_by_category(store, month, "Expense")
+    categories = sorted(expenses)
+    category_spending = pd.DataFrame({
+        "category": categories,
+        "amount": [expenses[category] / 100 for category in categories],
+    }, columns=["category", "amount"])
+    return {
+        "income": sum(income.values()) / 100,
+        "expenses": sum(expenses.values()) / 100,
+        "category_spending": category_spending,
+    }
+
+def monthly_summary(store):
+    """Returns total amounts per month (rows) and transaction type (columns), from the store's columns with NumPy."""
+    totals = {
+        transaction_type: numpy_backend.totals_by_month(store, transaction_type)
+        for transaction_type in sorted(store.types)
+    }
+    summary = (pd.DataFrame(totals).sort_index().fillna(0) / 100).rename_axis(index="month_year", columns="type")
+    return summary.loc[:, (summary != 0).any()]
+
+def recent_transactions(df, n=10):
+    """Returns the n most recent transactions, newest first; same-day rows keep ledger order."""
+    return df.nlargest(n, "date", keep="first")[DISPLAY_COLUMNS]
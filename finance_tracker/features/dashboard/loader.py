@@ -0,0 +1,53 @@
+# features/dashboard/loader.py
+"""Cached data loading for the Streamlit dashboard.
+
+Streamlit reruns the whole script on every widget interaction. The full
+transaction frame is built once per ledger version (its files' inode, size
+and mtime), from a Parquet snapshot when one of that version exists, and
+shared without copying; the dashboard itself only receives the
+small pre-aggregated frames below, each cached under the same version, so
+reruns neither re-parse nor re-aggregate and what is sent to the browser does
+not grow with the ledger. The totals are computed with NumPy straight from
+the ledger's columns, read without descriptions from a current snapshot.
+"""
+import streamlit as st
+from features.dashboard import frames
+from features.transactions.data import get_transaction_columns, get_transactions, ledger_version
+
+
+@st.cache_resource(show_spinner="Loading transactions...", max_entries=1)
+def _transactions_frame(version):
+    # Shared by every session and rerun, so it must never be modified.
+    return frames.store_to_frame(get_transactions())
+
+def _columns():
+    store = get_transaction_columns(descriptions=False)
+    return get_transactions() if store is None else store
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def _month_overview(version, month):
+    return frames.month_overview(_columns(), month)
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _monthly_summary(version):
+    return frames.monthly_summary(_columns())
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _recent_transactions(version, n):
+    return frames.recent_transactions(_transactions_frame(version), n)
+
+def load_transactions():
+    """Returns every transaction as a read-only DataFrame, as built by frames.store_to_frame()."""
+    return _transactions_frame(ledger_version())
+
+def load_month_overview(month):
+    """Returns the income, expenses and expenses by category of a YYYY-MM month."""
+    return _month_overview(ledger_version(), month)
+
+def load_monthly_summary():
+    """Returns total amounts per month (rows) and transaction type (columns)."""
+    return _monthly_summary(ledger_version())
+
+def load_recent_transactions(n=10):
+    """Returns the n most recent transactions, newest first."""
+    return _recent_transactions(ledger_version(), n)
@@ -0,0 +1,195 @@
+# features/data_management/bulk_import.py
+"""Parsing of CSV and JSON files for bulk import into the ledger.
+
+CSV files need a header row with at least date and amount columns (type,
+category and description are optional, matched case-insensitively), so both
+the app's own transactions.csv export and typical bank statements work. CSV
+amounts are in currency units; without a type column, negative amounts are
+expenses and positive ones income. Large CSV files are split into chunks of
+CHUNK_LINES lines parsed in a process pool, so a quoted field must not span
+lines.
+
+JSON files are the app's financial_data.json export, or a bare list of
+transactions, with amounts in cents.
+
+Every row is normalized to a (date, type, category, description, amount)
+record ready for save_transactions(); rows that cannot be are reported with
+their line or index instead.
+"""
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from itertools import islice
+from features.transactions.store import date_to_ordinal
+
+CHUNK_LINES = 50000
+
+# Files smaller than this are parsed in-process; starting a pool costs more than it saves.
+POOL_MIN_BYTES = 8 << 20
+
+TYPE_ALIASES = {"expense": "Expense", "debit": "Expense", "income": "Income", "credit": "Income"}
+DEFAULT_CATEGORY = "Other"
+
+CSV_COLUMNS = ("date", "type", "category", "description", "amount")
+
+
+def to_cents(value):
+    """Converts an amount in currency units such as "1,234.50" or "-12.5" to integer cents, rounding half up."""
+    text = str(value).strip()
+    # Fast path for plain amounts with at most two decimals, which is nearly every row.
+    digits = text[1:] if text[:1] == "-" else text
+    whole, _, fraction = digits.partition(".")
+    if whole.isdigit() and len(fraction) <= 2 and (fraction.isdigit() or not fraction):
+        cents = int(whole) * 100 + int(fraction.ljust(2, "0"))
+        return -cents if digits is not text else cents
+    try:
+        amount = Decimal(str(value).strip().replace(",", ""))
+    except InvalidOperation:
+        raise ValueError(f"invalid amount {value!r}") from None
+    if not amount.is_finite():
+        raise ValueError(f"invalid amount {value!r}")
+    return int((amount * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+def _clean_text(value):
+    # The text ledger is comma-separated and line-based.
+    return " ".join(str(value).replace(",", " ").split())
+
+def normalize(date_str, transaction_type, category, description, cents):
+    """Validates one row and returns it as a ledger record.
+
+    date_str may carry a time after the date, transaction_type may be empty
+    (the sign of cents decides) or an alias such as "debit", and commas and
+    line breaks in text are replaced with spaces. Raises ValueError.
+    """
+    date_str = str(date_str).strip()
+    if len(date_str) > 10 and date_str[10] in " T":
+        date_str = date_str[:10]
+    try:
+        date_to_ordinal(date_str)
+    except ValueError:
+        raise ValueError(f"invalid date {date_str!r}, expected YYYY-MM-DD") from None
+
+    if not transaction_type:
+        transaction_type = "Expense" if cents < 0 else "Income"
+    else:
+        transaction_type = TYPE_ALIASES.get(str(transaction_type).strip().lower())
+        if transaction_type is None:
+            raise ValueError("type must be Expense or Income")
+    if cents == 0:
+        raise ValueError("amount must not be zero")
+
+    category = _clean_text(category or "") or DEFAULT_CATEGORY
+    return date_str, transaction_type, category, _clean_text(description or ""), abs(cents)
+
+def csv_columns(header):
+    """Returns the positions of (date, type, category, description, amount) in a CSV header, None if absent."""
+    positions = {name.strip().lower(): i for i, name in enumerate(header)}
+    missing = [name for name in ("date", "amount") if name not in positions]
+    if missing:
+        raise ValueError(f"CSV header has no {' or '.join(missing)} column")
+    return tuple(positions.get(name) for name in CSV_COLUMNS)
+
+def parse_csv_lines(lines, first_line, columns):
+    """Parses CSV data lines into records. Returns (records, errors); errors are "line N: message" strings."""
+    records, errors = [], []
+    width = max(position for position in columns if position is not None) + 1
+    date_at, type_at, category_at, description_at, amount_at = columns
+    for line_number, row in enumerate(csv.reader(lines), first_line):
+        if not row:
+            continue
+        try:
+            if len(row) < width:
+                raise ValueError(f"expected at least {width} fields, got {len(row)}")
+            records.append(normalize(
+                row[date_at],
+                row[type_at] if type_at is not None else None,
+                row[category_at] if category_at is not None else None,
+                row[description_at] if description_at is not None else None,
+                to_cents(row[amount_at]),
+            ))
+        except ValueError as e:
+            errors.append(f"line {line_number}: {e}")
+    return records, errors
+
+def _parse_chunk(chunk):
+    return parse_csv_lines(*chunk)
+
+def _chunks(file, columns):
+    line_number = 2
+    while True:
+        lines = list(islice(file, CHUNK_LINES))
+        if not lines:
+            return
+        yield lines, line_number, columns
+        line_number += len(lines)
+
+def parse_csv(file, workers=None, size=None):
+    """Parses an open CSV file into {"records", "errors", "rows", "workers"}.
+
+    With workers=None a process pool with one worker per CPU is used when
+    size (the file's size in bytes) is at least POOL_MIN_BYTES; workers=1
+    always parses in-process.
+    """
+    header = next(csv.reader([file.readline()]), None)
+    if not header:
+        return {"records": [], "errors": [], "rows": 0, "workers": 1}
+    columns = csv_columns(header)
+
+    if workers is None:
+        workers = (os.cpu_count() or 1) if size is None or size >= POOL_MIN_BYTES else 1
+    chunks = _chunks(file, columns)
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_parse_chunk, chunks))
+    else:
+        results = [_parse_chunk(chunk) for chunk in chunks]
+
+    records, errors = [], []
+    for chunk_records, chunk_errors in results:
+        records.extend(chunk_records)
+        errors.extend(chunk_errors)
+    return {"records": records, "errors": errors, "rows": len(records) + len(errors), "workers": workers}
+
+def _pairs(values, label):
+    if not isinstance(values, dict):
+        raise ValueError(f"{label} must be an object")
+    pairs = {}
+    for name, amount in values.items():
+        if not isinstance(amount, int) or isinstance(amount, bool) or amount <= 0:
+            raise ValueError(f"{label} {name!r} must be a positive number of cents")
+        pairs[_clean_text(name)] = amount
+    return pairs
+
+def parse_json(file):
+    """Parses an open financial_data.json export, or a JSON list of transactions.
+
+    Returns {"records", "errors", "rows", "budgets", "goals"}; amounts are in cents.
+    """
+    document = json.load(file)
+    budgets, goals = {}, {}
+    if isinstance(document, dict):
+        transactions = document.get("transactions", [])
+        budgets = _pairs(document.get("budgets", {}), "budget")
+        goals = _pairs(document.get("goals", {}), "goal")
+    else:
+        transactions = document
+    if not isinstance(transactions, list):
+        raise ValueError("transactions must be a list")
+
+    records, errors = [], []
+    for index, transaction in enumerate(transactions):
+        try:
+            if not isinstance(transaction, dict):
+                raise ValueError("expected an object")
+            amount = transaction.get("amount")
+            if not isinstance(amount, int) or isinstance(amount, bool):
+                raise ValueError(f"amount must be an integer number of cents: {amount!r}")
+            records.append(normalize(
+                transaction.get("date", ""), transaction.get("type"), transaction.get("category"),
+                transaction.get("description"), amount,
+            ))
+        except ValueError as e:
+            errors.append(f"transaction {index}: {e}")
+    return {"records": records, "errors": errors, "rows": len(transactions), "budgets": budgets, "goals": goals}
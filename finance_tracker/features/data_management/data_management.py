@@ -1,56 +1,435 @@
 import csv
+import gzip
 import json
+import lzma
+import os
+import time
+from datetime import datetime
+from itertools import islice
+from json.encoder import encode_basestring_ascii as encode_string
+import questionary
 from rich.console import Console
-from features.transactions.transactions import get_transactions
-from features.budgets.budgets import get_budgets
-from features.smart_assistant.smart_assistant import get_goals
+from rich.progress import Progress, SpinnerColumn, TextColumn, TimeElapsedColumn
+from features.data_management import bulk_import
+from features.transactions import parquet
+from features.transactions.data import (
+    get_budgets, get_goals, get_transactions, has_transactions, iter_transactions, iter_transactions_between,
+    mark_duplicates, save_budget, save_goal, save_transactions, split_duplicates, verify_totals
+)
+from features.transactions.store import FIELDS
 
 console = Console()
 
-def export_to_csv():
-    """Exports all transactions to a CSV file."""
-    transactions = get_transactions()
-    if not transactions:
+CSV_FILE = "transactions.csv"
+JSON_FILE = "financial_data.json"
+NDJSON_FILE = "transactions.ndjson"
+PARQUET_FILE = "transactions.parquet"
+
+# Invalid rows listed when a bulk import finds some.
+IMPORT_ERRORS_SHOWN = 10
+
+# Rows formatted and written per chunk, and the write buffer of uncompressed exports.
+EXPORT_CHUNK_ROWS = 10000
+WRITE_BUFFER_BYTES = 1 << 20
+
+def open_export(path, compression=None):
+    """Opens an export file for writing text, gzip- or xz-compressed if asked or if the path ends in .gz/.xz."""
+    if compression is None:
+        compression = {".gz": "gzip", ".xz": "xz"}.get(os.path.splitext(path)[1])
+    if compression == "gzip":
+        return gzip.open(path, "wt", newline="", encoding="utf-8")
+    if compression == "xz":
+        return lzma.open(path, "wt", newline="", encoding="utf-8")
+    if compression is not None:
+        raise ValueError(f"Unknown compression: {compression}")
+    return open(path, "w", newline="", encoding="utf-8", buffering=WRITE_BUFFER_BYTES)
+
+def _export_progress():
+    return Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        TextColumn("{task.completed:,} rows"),
+        TimeElapsedColumn(),
+        console=console,
+        transient=True,
+        disable=not console.is_terminal,
+    )
+
+def export_to_csv(path=CSV_FILE, compression=None, date_from=None, date_to=None):
+    """Exports transactions to a CSV file, streaming the ledger in chunks.
+
+    compression is None, "gzip" or "xz"; date_from and date_to optionally
+    limit the export to an inclusive date range. Memory use does not depend
+    on the number of transactions.
+    """
+    if not has_transactions():
         console.print("[yellow]No transactions to export.[/yellow]")
         return
 
+    count = 0
+    started = time.perf_counter()
     try:
-        with open("transactions.csv", "w", newline="", encoding="utf-8") as file:
+        records = iter_transactions_between(date_from, date_to)
+        with open_export(path, compression) as file, _export_progress() as progress:
+            task = progress.add_task("Exporting transactions", total=None)
             writer = csv.writer(file)
             # Write header
             writer.writerow(["Date", "Type", "Category", "Description", "Amount"])
             # Write transaction data
-            for t in transactions:
-                writer.writerow([
-                    t["date"],
-                    t["type"],
-                    t["category"],
-                    t["description"],
-                    t["amount"] / 100
-                ])
-        console.print("[green]Successfully exported transactions to transactions.csv[/green]")
-    except IOError as e:
+            while True:
+                chunk = [
+                    (date, transaction_type, category, description, amount / 100)
+                    for date, transaction_type, category, description, amount in islice(records, EXPORT_CHUNK_ROWS)
+                ]
+                if not chunk:
+                    break
+                writer.writerows(chunk)
+                count += len(chunk)
+                progress.update(task, completed=count)
+    except (IOError, ValueError) as e:
         console.print(f"[red]Error exporting to CSV: {e}[/red]")
+        return
+
+    elapsed = time.perf_counter() - started
+    console.print(f"[green]Successfully exported {count:,} transactions to {path}[/green] ({count / max(elapsed, 1e-9):,.0f} rows/sec)")
+
+def _ask_date(message):
+    answer = (questionary.text(message).ask() or "").strip()
+    return answer or None
 
-def export_to_json():
-    """Exports all financial data to a JSON file."""
-    transactions = get_transactions()
+def export_to_csv_interactive():
+    """Asks for the target file, compression and date range, then exports to CSV."""
+    compression = questionary.select("Compression:", choices=["None", "gzip", "xz"]).ask()
+    compression = None if compression == "None" else compression
+    suffix = {"gzip": ".gz", "xz": ".xz"}.get(compression, "")
+    path = questionary.text("Export to:", default=CSV_FILE + suffix).ask()
+    date_from = _ask_date("From date (YYYY-MM-DD, blank for the first transaction):")
+    date_to = _ask_date("To date (YYYY-MM-DD, blank for the last transaction):")
+    try:
+        # strptime also accepts unpadded dates such as 2025-3-1; pass them on as ISO dates.
+        date_from, date_to = (
+            None if value is None else datetime.strptime(value, "%Y-%m-%d").date() for value in (date_from, date_to)
+        )
+    except ValueError:
+        console.print("[red]Invalid date format. Please use YYYY-MM-DD.[/red]")
+        return
+    export_to_csv(path, compression, date_from, date_to)
+
+def _transaction_json(record, colon, comma):
+    """Encodes a (date, type, category, description, amount) record exactly as json.dumps would, without building a dict."""
+    date_str, transaction_type, category, description, amount = record
+    return (
+        f'{{"date"{colon}{encode_string(date_str)}{comma}"type"{colon}{encode_string(transaction_type)}{comma}'
+        f'"category"{colon}{encode_string(category)}{comma}"description"{colon}{encode_string(description)}{comma}'
+        f'"amount"{colon}{int(amount)}}}'
+    )
+
+def _write_json(file, records, budgets, goals, progress, task):
+    """Writes the export document with the transactions array encoded a chunk at a time."""
+    separator = "\n        "
+    file.write('{\n    "transactions": [')
+    count = 0
+    while True:
+        chunk = [_transaction_json(record, ": ", ", ") for record in islice(records, EXPORT_CHUNK_ROWS)]
+        if not chunk:
+            break
+        file.write(("," if count else "") + separator + ("," + separator).join(chunk))
+        count += len(chunk)
+        progress.update(task, completed=count)
+    file.write(f'\n    ],\n    "budgets": {json.dumps(budgets)},\n    "goals": {json.dumps(goals)}\n}}\n')
+    return count
+
+def _write_ndjson(file, records, progress, task):
+    """Writes one compact JSON object per transaction per line."""
+    count = 0
+    while True:
+        chunk = [_transaction_json(record, ":", ",") + "\n" for record in islice(records, EXPORT_CHUNK_ROWS)]
+        if not chunk:
+            break
+        file.write("".join(chunk))
+        count += len(chunk)
+        progress.update(task, completed=count)
+    return count
+
+def export_to_json(path=JSON_FILE, compression=None):
+    """Exports all financial data to a JSON file, streaming the transactions array."""
     budgets = get_budgets()
     goals = get_goals()
 
-    if not transactions and not budgets and not goals:
+    if not has_transactions() and not budgets and not goals:
         console.print("[yellow]No data to export.[/yellow]")
         return
 
-    data = {
-        "transactions": transactions,
-        "budgets": budgets,
-        "goals": goals
-    }
-
+    started = time.perf_counter()
     try:
-        with open("financial_data.json", "w", encoding="utf-8") as file:
-            json.dump(data, file, indent=4)
-        console.print("[green]Successfully exported all data to financial_data.json[/green]")
+        with open_export(path, compression) as file, _export_progress() as progress:
+            task = progress.add_task("Exporting transactions", total=None)
+            count = _write_json(file, iter_transactions(), budgets, goals, progress, task)
     except IOError as e:
         console.print(f"[red]Error exporting to JSON: {e}[/red]")
+        return
+
+    elapsed = time.perf_counter() - started
+    console.print(f"[green]Successfully exported all data to {path}[/green] ({count / max(elapsed, 1e-9):,.0f} rows/sec)")
+
+def export_to_ndjson(path=NDJSON_FILE, compression=None):
+    """Exports transactions as JSON Lines, one transaction per line."""
+    if not has_transactions():
+        console.print("[yellow]No transactions to export.[/yellow]")
+        return
+
+    started = time.perf_counter()
+    try:
+        with open_export(path, compression) as file, _export_progress() as progress:
+            task = progress.add_task("Exporting transactions", total=None)
+            count = _write_ndjson(file, iter_transactions(), progress, task)
+    except IOError as e:
+        console.print(f"[red]Error exporting to JSON Lines: {e}[/red]")
+        return
+
+    elapsed = time.perf_counter() - started
+    console.print(f"[green]Successfully exported {count:,} transactions to {path}[/green] ({count / max(elapsed, 1e-9):,.0f} rows/sec)")
+
+def open_import(path):
+    """Opens an import file for reading text, decompressing .gz/.xz files and skipping a UTF-8 BOM."""
+    extension = os.path.splitext(path)[1]
+    if extension == ".gz":
+        return gzip.open(path, "rt", newline="", encoding="utf-8-sig")
+    if extension == ".xz":
+        return lzma.open(path, "rt", newline="", encoding="utf-8-sig")
+    return open(path, "r", newline="", encoding="utf-8-sig")
+
+def transaction_record(fields):
+    """Validates a transaction dict with amount in cents and returns it as a ledger record.
+
+    Checked and cleaned by bulk_import.normalize(), like every other import:
+    zero amounts are rejected, a blank category becomes the default one.
+    Raises ValueError.
+    """
+    try:
+        date_str, transaction_type, category, description, amount = (fields[name] for name in FIELDS)
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"missing field {e}") from None
+    if not isinstance(amount, int) or isinstance(amount, bool):
+        raise ValueError(f"amount must be an integer number of cents: {amount!r}")
+    if not transaction_type:
+        raise ValueError("type must be Expense or Income")
+    return bulk_import.normalize(date_str, transaction_type, category, description, amount)
+
+def _report_invalid(errors, invalid, rows):
+    """Prints how many rows are invalid and the first IMPORT_ERRORS_SHOWN errors."""
+    console.print(f"[yellow]{invalid:,} of {rows:,} rows are invalid:[/yellow]")
+    for error in errors[:IMPORT_ERRORS_SHOWN]:
+        console.print(f"  {error}")
+    if invalid > IMPORT_ERRORS_SHOWN:
+        console.print(f"  ... and {invalid - IMPORT_ERRORS_SHOWN:,} more")
+
+def _valid_records(rows):
+    for record, error in rows:
+        if error is not None:
+            raise ValueError(f"{error} (the file changed during the import)")
+        yield record
+
+def _import_rows(path, read_rows, read_errors, skip_duplicates=True):
+    """Imports the records of a file too large to hold, streaming it twice.
+
+    read_rows(path) yields (record, None) for a valid row and (None, "row N:
+    message") for an invalid one. The first pass validates the rows and finds
+    those already in the ledger, so if any row is invalid nothing is
+    imported; the second appends the records in batches, without the
+    duplicates unless skip_duplicates is False. read_errors are the
+    exceptions reading the file may raise.
+    """
+    started = time.perf_counter()
+    found = {"rows": 0, "invalid": 0}
+    errors = []
+
+    def checked(rows):
+        for record, error in rows:
+            found["rows"] += 1
+            if error is None:
+                yield record
+                continue
+            found["invalid"] += 1
+            if len(errors) < IMPORT_ERRORS_SHOWN:
+                errors.append(error)
+
+    try:
+        with console.status(f"Checking {path}..."):
+            # Positions among the valid records; only duplicates are kept in memory.
+            duplicates = {
+                position for position, (_, duplicate) in enumerate(mark_duplicates(checked(read_rows(path))))
+                if duplicate
+            }
+        if found["invalid"]:
+            _report_invalid(errors, found["invalid"], found["rows"])
+            console.print("[red]Nothing was imported.[/red]")
+            return
+        if not found["rows"]:
+            console.print("[yellow]No transactions to import.[/yellow]")
+            return
+        if duplicates:
+            action = "Skipping" if skip_duplicates else "Importing"
+            console.print(f"[yellow]{action} {len(duplicates):,} transactions that are already in the ledger.[/yellow]")
+        records = _valid_records(read_rows(path))
+        if skip_duplicates and duplicates:
+            if len(duplicates) == found["rows"]:
+                console.print("[yellow]No new transactions to import.[/yellow]")
+                return
+            records = (record for position, record in enumerate(records) if position not in duplicates)
+        count = save_transactions(records)
+    except read_errors as e:
+        console.print(f"[red]Error importing {path}: {e}[/red]")
+        return
+
+    elapsed = time.perf_counter() - started
+    console.print(f"[green]Successfully imported {count:,} transactions from {path}[/green] ({count / max(elapsed, 1e-9):,.0f} rows/sec)")
+
+def _ndjson_rows(path):
+    with open_import(path) as file:
+        for line_number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            try:
+                yield transaction_record(json.loads(line)), None
+            except ValueError as e:
+                yield None, f"line {line_number}: {e}"
+
+def import_from_ndjson(path=NDJSON_FILE, skip_duplicates=True):
+    """Imports JSON Lines transactions, streaming them into the ledger in batches.
+
+    The file is validated first; if any line is invalid nothing is imported.
+    Transactions already in the ledger are skipped, or only reported when
+    skip_duplicates is False.
+    """
+    _import_rows(path, _ndjson_rows, (IOError, ValueError), skip_duplicates)
+
+def _is_snapshot(path):
+    return os.path.abspath(path) == os.path.abspath(parquet.PARQUET_FILE)
+
+def export_to_parquet(path=PARQUET_FILE):
+    """Exports transactions to a Parquet file with dictionary-encoded type and category and int64 cents.
+
+    The ledger's own snapshot is written separately, by
+    python -m features.transactions.parquet, so the path must not be the
+    snapshot's.
+    """
+    if not parquet.available():
+        console.print("[red]Parquet export needs pyarrow: pip install pyarrow[/red]")
+        return
+    if _is_snapshot(path):
+        console.print(f"[red]{path} is the ledger's snapshot; export to another file.[/red]")
+        return
+    if not has_transactions():
+        console.print("[yellow]No transactions to export.[/yellow]")
+        return
+
+    started = time.perf_counter()
+    try:
+        transactions = get_transactions()
+        parquet.write(transactions, path)
+        count = len(transactions)
+    except (IOError, parquet.pa.ArrowException) as e:
+        console.print(f"[red]Error exporting to Parquet: {e}[/red]")
+        return
+
+    elapsed = time.perf_counter() - started
+    console.print(f"[green]Successfully exported {count:,} transactions to {path}[/green] ({count / max(elapsed, 1e-9):,.0f} rows/sec)")
+
+def _parquet_rows(path):
+    for row, record in enumerate(parquet.iter_records(path), 1):
+        try:
+            yield transaction_record(dict(zip(FIELDS, record))), None
+        except ValueError as e:
+            yield None, f"row {row}: {e}"
+
+def import_from_parquet(path=PARQUET_FILE, skip_duplicates=True):
+    """Imports transactions from a Parquet file, streaming them into the ledger a row group at a time.
+
+    The file is validated first; if any row is invalid nothing is imported.
+    Transactions already in the ledger are skipped, or only reported when
+    skip_duplicates is False. The ledger's own snapshot is refused, since
+    importing it would double every transaction.
+    """
+    if not parquet.available():
+        console.print("[red]Parquet import needs pyarrow: pip install pyarrow[/red]")
+        return
+    if _is_snapshot(path):
+        console.print(f"[red]{path} is the snapshot of the ledger itself; its transactions are already recorded.[/red]")
+        return
+    _import_rows(path, _parquet_rows, (IOError, ValueError, KeyError, parquet.pa.ArrowException), skip_duplicates)
+
+def import_file(path, workers=None, skip_invalid=False, skip_duplicates=True):
+    """Bulk-imports transactions from a CSV or JSON file (optionally .gz/.xz compressed).
+
+    Every row is parsed and validated first, large CSV files in a process
+    pool, and the valid rows are then appended with one batched write. If
+    any row is invalid nothing is imported unless skip_invalid is True.
+    Rows already in the ledger are skipped, or only reported when
+    skip_duplicates is False. Budgets and goals in a financial_data.json
+    export are saved too.
+    """
+    extension = os.path.splitext(path[:-3] if path.endswith((".gz", ".xz")) else path)[1].lower()
+    started = time.perf_counter()
+    try:
+        with open_import(path) as file, console.status(f"Parsing {path}..."):
+            if extension == ".json":
+                parsed = bulk_import.parse_json(file)
+            else:
+                parsed = bulk_import.parse_csv(file, workers, os.path.getsize(path))
+    except (IOError, ValueError) as e:
+        console.print(f"[red]Error reading {path}: {e}[/red]")
+        return
+
+    errors = parsed["errors"]
+    if errors:
+        _report_invalid(errors, len(errors), parsed["rows"])
+        if not skip_invalid:
+            console.print("[red]Nothing was imported.[/red]")
+            return
+
+    records = parsed["records"]
+    if not records and not parsed.get("budgets") and not parsed.get("goals"):
+        console.print("[yellow]No transactions to import.[/yellow]")
+        return
+    records, duplicates = split_duplicates(records)
+    if duplicates:
+        action = "Skipping" if skip_duplicates else "Importing"
+        console.print(f"[yellow]{action} {len(duplicates):,} transactions that are already in the ledger.[/yellow]")
+        if not skip_duplicates:
+            records += duplicates
+    if not records and not parsed.get("budgets") and not parsed.get("goals"):
+        console.print("[yellow]No new transactions to import.[/yellow]")
+        return
+    count = save_transactions(records, batch_rows=max(len(records), 1))
+    for category, amount in parsed.get("budgets", {}).items():
+        save_budget(category, amount)
+    for name, amount in parsed.get("goals", {}).items():
+        save_goal(name, amount)
+
+    elapsed = time.perf_counter() - started
+    console.print(f"[green]Successfully imported {count:,} transactions from {path}[/green] ({count / max(elapsed, 1e-9):,.0f} rows/sec)")
+    if parsed.get("budgets") or parsed.get("goals"):
+        console.print(f"[green]Saved {len(parsed.get('budgets', {}))} budgets and {len(parsed.get('goals', {}))} goals.[/green]")
+
+def import_file_interactive():
+    """Asks for the file to import and whether to skip invalid and duplicate rows, then bulk-imports it."""
+    path = questionary.text("Import from (CSV or JSON):", default=CSV_FILE).ask()
+    if not path:
+        return
+    skip_invalid = questionary.confirm("Skip invalid rows instead of cancelling the import?", default=False).ask()
+    skip_duplicates = questionary.confirm("Skip transactions that are already in the ledger?", default=True).ask()
+    import_file(path, skip_invalid=skip_invalid, skip_duplicates=skip_duplicates)
+
+def verify_running_totals():
+    """Recomputes the running income and expense totals from the ledger and reports any drift."""
+    stored, actual = verify_totals()
+    if stored == actual:
+        console.print("[green]Running totals match the ledger.[/green]")
+        return
+
+    console.print("[yellow]Running totals were out of date and have been rebuilt from the ledger.[/yellow]")
+    for transaction_type in sorted(set(stored or {}) | set(actual)):
+        before = (stored or {}).get(transaction_type, 0)
+        after = actual.get(transaction_type, 0)
+        console.print(f"{transaction_type}: {before / 100:.2f} -> {after / 100:.2f}")
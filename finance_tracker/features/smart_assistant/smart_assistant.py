@@ -4,48 +4,38 @@ import questionary
 from rich.console import Console
 from rich.panel import Panel
 from rich.progress_bar import ProgressBar
-from features.transactions.transactions import get_transactions
-from features.budgets.budgets import get_budgets
+from features.analytics import numpy_backend
+from features.budgets.evaluator import evaluate_budgets
+from features.transactions.data import (
+    get_budgets, get_category_totals, get_goal_progress, get_month_total, get_transaction_columns, get_transactions,
+    get_unusual_expenses, latest_transaction_date, range_total, save_goal, transactions_above
+)
+from features.transactions.day_index import month_bounds
+from features.transactions.partitions import months_between
 
 # Create a console object
 console = Console()
 
-# Define the path to the goals file
-GOALS_FILE = "database/goals.txt"
-
-def get_goals():
-    """Reads all goals from the goals file."""
-    try:
-        with open(GOALS_FILE, "r") as file:
-            lines = file.readlines()
-        
-        goals = {}
-        for line in lines:
-            name, amount = line.strip().split(",")
-            goals[name] = int(amount)
-        return goals
-    except FileNotFoundError:
-        return {}
-
-def save_goal(name, amount):
-    """Saves a goal to the goals file."""
-    goals = get_goals()
-    goals[name] = amount
-    with open(GOALS_FILE, "w") as file:
-        for name, amount in goals.items():
-            file.write(f"{name},{amount}\n")
-
-def get_income_stability(transactions):
+def get_income_stability():
     """Analyzes income stability over the last few months."""
     income_by_month = {}
-    three_months_ago = datetime.now() - timedelta(days=90)
-    
-    for t in transactions:
-        if t["type"] == "Income":
-            transaction_date = datetime.strptime(t["date"], "%Y-%m-%d")
-            if transaction_date > three_months_ago:
-                month = transaction_date.strftime("%Y-%m")
-                income_by_month[month] = income_by_month.get(month, 0) + t["amount"]
+    today = datetime.now().date()
+    # Income dated after the day exactly 90 days ago; each month is one range query.
+    window_start = today - timedelta(days=89)
+    latest = latest_transaction_date()
+    if latest is None or latest < window_start:
+        return "Irregular" # Not enough data
+    if numpy_backend.available():
+        # One masked pass over the date and type columns; descriptions are not needed.
+        store = get_transaction_columns(descriptions=False)
+        store = get_transactions() if store is None else store
+        income_by_month = numpy_backend.totals_by_month(store, "Income", start=window_start.toordinal())
+    else:
+        for month in months_between(window_start, latest):
+            month_start, month_end = month_bounds(month)
+            total = range_total(max(window_start.toordinal(), month_start), month_end, "Income")
+            if total:
+                income_by_month[month] = total
                 
     if len(income_by_month) < 2:
         return "Irregular" # Not enough data
@@ -65,16 +55,11 @@ def daily_financial_check():
     console.print("[bold blue]Generating your daily financial check...[/bold blue]")
 
     # Get data
-    transactions = get_transactions()
     budgets = get_budgets()
     
     # Calculate today's spending
     today = datetime.now().date()
-    today_spending = sum(
-        t["amount"] for t in transactions 
-        if t["type"] == "Expense" 
-        and datetime.strptime(t["date"], "%Y-%m-%d").date() == today
-    )
+    today_spending = range_total(today, today, "Expense")
 
     # Calculate daily budget
     total_budget = sum(budgets.values())
@@ -87,27 +72,15 @@ def daily_financial_check():
     
     # Budget warnings
     current_month = today.strftime("%Y-%m")
-    for category, budget_amount in budgets.items():
-        spent_amount = sum(
-            t["amount"] for t in transactions
-            if t["type"] == "Expense" 
-            and t["category"] == category
-            and t["date"].startswith(current_month)
-        )
-        utilization = (spent_amount / budget_amount) * 100 if budget_amount > 0 else 0
-        if utilization > 80:
-            alerts.append(f"⚠️ [bold yellow]Budget Warning:[/bold yellow] {category} category is at {utilization:.2f}% of its budget.")
+    for category, result in evaluate_budgets(current_month).items():
+        if result["utilization"] > 80:
+            alerts.append(f"⚠️ [bold yellow]Budget Warning:[/bold yellow] {category} category is at {result['utilization']:.2f}% of its budget.")
 
     # Large transaction alerts
-    total_income_this_month = sum(
-        t["amount"] for t in transactions 
-        if t["type"] == "Income" 
-        and t["date"].startswith(current_month)
-    )
+    total_income_this_month = get_month_total(current_month, "Income")
     if total_income_this_month > 0:
-        for t in transactions:
-            if t["type"] == "Expense" and t["amount"] > (total_income_this_month * 0.2):
-                alerts.append(f"💸 [bold red]Large Transaction:[/bold red] A transaction of {t['amount']/100:.2f} for {t['description']} was detected.")
+        for t in transactions_above(current_month, total_income_this_month * 0.2, "Expense"):
+            alerts.append(f"💸 [bold red]Large Transaction:[/bold red] A transaction of {t['amount']/100:.2f} for {t['description']} was detected.")
 
     # Generate a quick tip
     tips = [
@@ -148,26 +121,21 @@ def generate_smart_recommendations():
     """Generates and displays smart financial recommendations."""
     console.print("[bold blue]Analyzing your financial habits for recommendations...[/bold blue]")
 
-    transactions = get_transactions()
+    now = datetime.now()
     budgets = get_budgets()
     recommendations = []
 
-    current_month = datetime.now().strftime("%Y-%m")
+    current_month = now.strftime("%Y-%m")
+    category_spending = get_category_totals(current_month, "Expense")
     
     # Recommendation: Overspending categories
-    for category, budget_amount in budgets.items():
-        spent_amount = sum(
-            t["amount"] for t in transactions
-            if t["type"] == "Expense" 
-            and t["category"] == category
-            and t["date"].startswith(current_month)
-        )
-        if spent_amount > budget_amount:
-            recommendations.append(f"Consider reducing spending in the [bold]{category}[/bold] category. You are over budget by {(spent_amount - budget_amount)/100:.2f}.")
+    for category, result in evaluate_budgets(current_month).items():
+        if result["spent"] > result["budget"]:
+            recommendations.append(f"Consider reducing spending in the [bold]{category}[/bold] category. You are over budget by {-result['remaining']/100:.2f}.")
 
     # Recommendation: Savings rate
-    total_income = sum(t["amount"] for t in transactions if t["type"] == "Income" and t["date"].startswith(current_month))
-    total_expenses = sum(t["amount"] for t in transactions if t["type"] == "Expense" and t["date"].startswith(current_month))
+    total_income = get_month_total(current_month, "Income")
+    total_expenses = sum(category_spending.values())
     
     if total_income > 0:
         savings_rate = ((total_income - total_expenses) / total_income) * 100
@@ -177,7 +145,7 @@ def generate_smart_recommendations():
             recommendations.append("Great job on your savings rate! Keep it up or consider increasing your savings goal.")
 
     # Recommendation: Irregular income
-    income_stability = get_income_stability(transactions)
+    income_stability = get_income_stability()
     if income_stability == "Irregular":
         recommendations.append("Your income seems irregular. Consider building an emergency fund covering 3-6 months of expenses.")
 
@@ -205,41 +173,27 @@ def show_spending_alerts():
     """Displays all active spending alerts."""
     console.print("[bold blue]Checking for spending alerts...[/bold blue]")
     
-    transactions = get_transactions()
-    budgets = get_budgets()
     alerts = []
     
     current_month = datetime.now().strftime("%Y-%m")
+    category_spending = get_category_totals(current_month, "Expense")
     
     # Budget warnings
-    for category, budget_amount in budgets.items():
-        spent_amount = sum(
-            t["amount"] for t in transactions
-            if t["type"] == "Expense" 
-            and t["category"] == category
-            and t["date"].startswith(current_month)
-        )
-        utilization = (spent_amount / budget_amount) * 100 if budget_amount > 0 else 0
-        if utilization > 80:
-            alerts.append(f"⚠️ [bold yellow]Budget Warning:[/bold yellow] {category} category is at {utilization:.2f}% of its budget.")
+    for category, result in evaluate_budgets(current_month).items():
+        if result["utilization"] > 80:
+            alerts.append(f"⚠️ [bold yellow]Budget Warning:[/bold yellow] {category} category is at {result['utilization']:.2f}% of its budget.")
 
     # Large transaction alerts
-    total_income_this_month = sum(
-        t["amount"] for t in transactions 
-        if t["type"] == "Income" 
-        and t["date"].startswith(current_month)
-    )
+    total_income_this_month = get_month_total(current_month, "Income")
     if total_income_this_month > 0:
-        for t in transactions:
-            if t["type"] == "Expense" and t["amount"] > (total_income_this_month * 0.2):
-                alerts.append(f"💸 [bold red]Large Transaction:[/bold red] A transaction of {t['amount']/100:.2f} for {t['description']} was detected.")
+        for t in transactions_above(current_month, total_income_this_month * 0.2, "Expense"):
+            alerts.append(f"💸 [bold red]Large Transaction:[/bold red] A transaction of {t['amount']/100:.2f} for {t['description']} was detected.")
+
+    # Expenses far above their category's usual amount, flagged as they were recorded
+    for t in get_unusual_expenses(current_month):
+        alerts.append(f"🔎 [bold magenta]Unusual Expense:[/bold magenta] {t['amount']/100:.2f} for {t['description']} is well above your usual {t['category']} spending of {t['category_mean']/100:.2f}.")
     
     # Top spending categories
-    category_spending = {}
-    for t in transactions:
-        if t["type"] == "Expense" and t["date"].startswith(current_month):
-            category_spending[t["category"]] = category_spending.get(t["category"], 0) + t["amount"]
-    
     if category_spending:
         top_category = max(category_spending, key=category_spending.get)
         alerts.append(f"📈 [bold]Top Spending Category:[/bold] Your highest spending this month is in the [bold]{top_category}[/bold] category.")
@@ -284,13 +238,8 @@ def manage_savings_and_goals():
 def view_savings_opportunities():
     """Analyzes spending and suggests savings opportunities."""
     console.print("[bold blue]Finding savings opportunities...[/bold blue]")
-    transactions = get_transactions()
-    
     current_month = datetime.now().strftime("%Y-%m")
-    category_spending = {}
-    for t in transactions:
-        if t["type"] == "Expense" and t["date"].startswith(current_month):
-            category_spending[t["category"]] = category_spending.get(t["category"], 0) + t["amount"]
+    category_spending = get_category_totals(current_month, "Expense")
             
     if not category_spending:
         console.print("[bold green]No spending this month to analyze.[/bold green]")
@@ -332,22 +281,17 @@ def set_new_goal():
     
 def view_goals_progress():
     """Displays progress towards savings goals."""
-    goals = get_goals()
-    transactions = get_transactions()
+    goal_progress = get_goal_progress()
     
-    if not goals:
+    if not goal_progress:
         console.print("[bold yellow]No savings goals set. Set one to get started![/bold yellow]")
         return
 
-    total_income = sum(t["amount"] for t in transactions if t["type"] == "Income")
-    total_expenses = sum(t["amount"] for t in transactions if t["type"] == "Expense")
-    total_savings = total_income - total_expenses
-    
     progress_text = ""
-    for name, amount in goals.items():
-        progress = (total_savings / amount) * 100 if amount > 0 else 0
+    for name, goal in goal_progress.items():
+        progress = goal["progress"]
         progress_bar = ProgressBar(total=100, completed=min(progress, 100), width=30)
-        progress_text += f"[bold]{name}[/bold] ({total_savings/100:.2f} / {amount/100:.2f})\n{progress_bar} {progress:.2f}%\n\n"
+        progress_text += f"[bold]{name}[/bold] ({goal['saved']/100:.2f} / {goal['target']/100:.2f})\n{progress_bar} {progress:.2f}%\n\n"
         
     console.print(
         Panel(
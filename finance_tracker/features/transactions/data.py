@@ -1,28 +1,537 @@
 # features/transactions/data.py
+import heapq
+import os
+import time
+from itertools import chain, islice
+from datetime import date
+from . import fingerprints, jsonfile, parquet, rollups, sqlite_backend, stats, totals
+from .derived import Derived
+from .day_index import DayIndex, month_bounds
+from .partitions import append_lines, group_by_month, is_partitioned, list_partitions, months_between, partition_path
+from .reader import iter_records, read_pairs, write_pairs
+from .sqlite_backend import SQLITE_FILE
+from .store import TransactionStore, date_to_ordinal, month_index, parse_date
 
 TRANSACTIONS_FILE = "database/transactions.txt"
+BUDGETS_FILE = "database/budgets.txt"
+GOALS_FILE = "database/goals.txt"
 
-def get_transactions():
-    """Reads all transactions from the transactions file."""
+# Rows buffered per write by save_transactions().
+BATCH_ROWS = 10000
+
+# "text" keeps everything in database/*.txt, "sqlite" uses database/finance.db.
+STORAGE_BACKEND = os.environ.get("FINANCE_TRACKER_BACKEND", "text")
+
+# Process-wide ledger cache. The parsed transactions are reused until the
+# ledger file's (inode, size, mtime) signature changes.
+_cache = {"key": None, "transactions": TransactionStore()}
+
+# Values derived from the ledger and kept current on every append. The text
+# ledger's monthly rollup is not used with SQLite, which keeps its own.
+_rollups = Derived(rollups.ROLLUPS_FILE, dict, rollups.apply)
+_stats = Derived(stats.STATS_FILE, stats.empty, stats.apply)
+_totals = Derived(totals.TOTALS_FILE, dict, totals.apply)
+_fingerprints = Derived(
+    fingerprints.FINGERPRINTS_FILE, fingerprints.empty, fingerprints.apply,
+    fingerprints.load, fingerprints.save, fingerprints.extend,
+)
+
+# Prefix-sum day index over the cached store, rebuilt whenever the store is replaced.
+_day_index = {"index": None}
+
+def _use_sqlite():
+    return STORAGE_BACKEND == "sqlite"
+
+def _file_key(path):
+    """Returns the (inode, size, mtime) signature of a file, or None if it does not exist."""
     try:
-        with open(TRANSACTIONS_FILE, "r") as file:
-            lines = file.readlines()
-        
-        transactions = []
-        for line in lines:
-            date, transaction_type, category, description, amount = line.strip().split(",")
-            transactions.append({
-                "date": date,
-                "type": transaction_type,
-                "category": category,
-                "description": description,
-                "amount": int(amount)
-            })
-        return transactions
+        stat = os.stat(path)
     except FileNotFoundError:
-        return []
+        return None
+    return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+def _ledger_key():
+    """Returns the signature of the files backing the active storage backend."""
+    if _use_sqlite():
+        return _file_key(SQLITE_FILE)
+    if is_partitioned():
+        return tuple((month, _file_key(path)) for month, path in list_partitions())
+    return _file_key(TRANSACTIONS_FILE)
+
+def ledger_version():
+    """Returns a value that changes whenever the ledger does, for keying derived results."""
+    return _ledger_key()
+
+def _in_months(records, months):
+    """Lazily yields the records dated in one of the YYYY-MM months, comparing integer month indexes."""
+    indexes = {month_index(month) for month in months}
+    return (record for record in records if month_index(record[0]) in indexes)
+
+def _read_ledger(months=None):
+    """Lazily yields stored transaction records from the active backend.
+
+    With months, only those YYYY-MM months are returned; in the partitioned
+    layout every other partition is skipped without being opened.
+    """
+    if not _use_sqlite():
+        return _read_text_ledger(months)
+    records = sqlite_backend.iter_transactions()
+    if months is None:
+        return records
+    return _in_months(records, months)
+
+def _read_text_ledger(months=None):
+    """Lazily yields the records of the text ledger, single-file or partitioned, whatever the backend."""
+    if is_partitioned():
+        return chain.from_iterable(iter_records(path) for _, path in list_partitions(months=months))
+    records = iter_records(TRANSACTIONS_FILE)
+    if months is None:
+        return records
+    return _in_months(records, months)
+
+def _cache_is_current():
+    """Returns True if the cached store matches the ledger on disk."""
+    return _cache["key"] is not None and _cache["key"] == _ledger_key()
+
+def get_transactions(months=None):
+    """Reads all transactions from the ledger, or only those in the given YYYY-MM months.
+
+    Returns a columnar TransactionStore whose rows behave like the old
+    transaction dicts. The full-ledger store is shared by every caller in the
+    process, so it must not be modified.
+    """
+    if months is not None:
+        months = set(months)
+        transactions = TransactionStore()
+        for record in iter_transactions(months):
+            transactions.append(*record)
+        return transactions
+
+    key = _ledger_key()
+    if key is None:
+        _cache["key"], _cache["transactions"] = None, TransactionStore()
+        return _cache["transactions"]
+
+    if _cache["key"] != key:
+        transactions = _read_snapshot(key)
+        if transactions is None:
+            transactions = TransactionStore()
+            for record in _read_ledger():
+                transactions.append(*record)
+        _cache["key"], _cache["transactions"] = key, transactions
+
+    return _cache["transactions"]
+
+def _read_snapshot(key, descriptions=True):
+    """Returns the Parquet snapshot as a store if it was taken of this ledger signature, else None."""
+    if not parquet.available() or parquet.ledger_key() != jsonfile.normalize(key):
+        return None
+    return parquet.read_store(descriptions=descriptions)
+
+def get_transaction_columns(descriptions=True):
+    """Returns every transaction without parsing the ledger, or None if that is not possible.
+
+    Served from the ledger cache when it is current, otherwise from a Parquet
+    snapshot of the current ledger. With descriptions=False the snapshot's
+    description column is skipped and every description is empty, which
+    is all an aggregation needs.
+    """
+    if _cache_is_current():
+        return _cache["transactions"]
+    key = _ledger_key()
+    if key is None:
+        return None
+    transactions = _read_snapshot(key, descriptions)
+    if transactions is not None and descriptions:
+        _cache["key"], _cache["transactions"] = key, transactions
+    return transactions
+
+def write_snapshot(path=parquet.PARQUET_FILE):
+    """Writes every transaction to a Parquet snapshot tagged with the ledger signature; returns the row count."""
+    transactions = get_transactions()
+    parquet.write(transactions, path, _cache["key"])
+    return len(transactions)
+
+def iter_transactions(months=None):
+    """Lazily yields transactions as (date, type, category, description, amount) tuples.
+
+    Served from the ledger cache when it is current; otherwise the ledger is
+    streamed without being loaded, so one-pass aggregations run in constant
+    memory. With months, only those YYYY-MM months are yielded.
+    """
+    if months is not None:
+        months = set(months)
+        if not is_partitioned() and _cache_is_current():
+            return _in_months(_cache["transactions"].records(), months)
+        return _read_ledger(months)
+
+    if _cache_is_current():
+        return _cache["transactions"].records()
+    return _read_ledger()
+
+def _as_date(value):
+    return value if isinstance(value, date) else date(*parse_date(value))
+
+def iter_transactions_between(date_from=None, date_to=None):
+    """Lazily yields transaction tuples dated from date_from to date_to inclusive; either may be None.
+
+    Bounds are dates or YYYY-MM-DD strings; a malformed string raises
+    ValueError. With both bounds only the months in between are read.
+    """
+    date_from = None if date_from is None else _as_date(date_from)
+    date_to = None if date_to is None else _as_date(date_to)
+    # Ledger dates are ISO strings, so ISO bounds compare correctly as strings.
+    start = None if date_from is None else date_from.isoformat()
+    end = None if date_to is None else date_to.isoformat()
+    months = None
+    if date_from is not None and date_to is not None:
+        months = months_between(date_from, date_to)
+    return (
+        record for record in iter_transactions(months)
+        if (start is None or record[0] >= start) and (end is None or record[0] <= end)
+    )
+
+def has_transactions():
+    """Returns True if at least one transaction has been recorded."""
+    return next(iter(iter_transactions()), None) is not None
+
+def _append_transactions(records, fsync=False):
+    """Appends a batch of (date, type, category, description, amount) records with a single write."""
+    key = _ledger_key()
+    cache_valid = _cache["key"] is not None and _cache["key"] == key
+    derived = [_stats, _totals, _fingerprints] if _use_sqlite() else [_rollups, _stats, _totals, _fingerprints]
+    # Only values that describe the ledger before this write can be extended; stale ones are rebuilt on next read.
+    current = [(value, value.current(key)) for value in derived]
+
+    if _use_sqlite():
+        sqlite_backend.save_transactions(records)
+    elif is_partitioned():
+        for month, month_records in group_by_month(records).items():
+            append_lines(partition_path(month), month_records, fsync)
+    else:
+        append_lines(TRANSACTIONS_FILE, records, fsync)
+
+    # Keep a warm cache warm instead of re-reading the whole ledger on the next read.
+    key = _ledger_key()
+    if cache_valid:
+        transactions = _cache["transactions"]
+        index = _day_index["index"]
+        for record in records:
+            transactions.append(*record)
+            if index is not None and index.store is transactions:
+                index.append(len(transactions) - 1)
+        _cache["key"] = key
+
+    for value, before in current:
+        if before is not None:
+            value.extend(before, records, key, fsync)
 
 def save_transaction(date, transaction_type, category, description, amount):
-    """Saves a transaction to the transactions file."""
-    with open(TRANSACTIONS_FILE, "a") as file:
-        file.write(f"{date},{transaction_type},{category},{description},{amount}\n")
+    """Saves a transaction to the ledger."""
+    _append_transactions([(date, transaction_type, category, description, amount)])
+
+def save_transactions(transactions, fsync=False, batch_rows=BATCH_ROWS):
+    """Saves many (date, type, category, description, amount) records in batches of batch_rows.
+
+    Returns the number of transactions saved.
+    """
+    with LedgerWriter(flush_every=batch_rows, fsync=fsync) as writer:
+        for record in transactions:
+            writer.write(*record)
+    return writer.count
+
+
+class LedgerWriter:
+    """Buffers transactions and appends them to the ledger in groups.
+
+    The buffer is flushed every flush_every rows, when flush_interval_ms has
+    passed since the last flush (checked on each write), and on exit. With
+    fsync=True each flush is forced to disk before it returns.
+
+        with LedgerWriter(flush_every=500, flush_interval_ms=200) as writer:
+            writer.write("2025-11-25", "Expense", "Food", "Lunch", 1250)
+    """
+
+    def __init__(self, flush_every=BATCH_ROWS, flush_interval_ms=None, fsync=False):
+        self.flush_every = flush_every
+        self.flush_interval_ms = flush_interval_ms
+        self.fsync = fsync
+        self.count = 0
+        self._pending = []
+        self._last_flush = time.monotonic()
+
+    def write(self, date, transaction_type, category, description, amount):
+        """Buffers one transaction, flushing if the row or time limit is reached."""
+        self._pending.append((date, transaction_type, category, description, amount))
+        self.count += 1
+        if len(self._pending) >= self.flush_every:
+            self.flush()
+        elif self.flush_interval_ms is not None:
+            if (time.monotonic() - self._last_flush) * 1000 >= self.flush_interval_ms:
+                self.flush()
+
+    def flush(self):
+        """Appends all buffered transactions to the ledger."""
+        if self._pending:
+            _append_transactions(self._pending, fsync=self.fsync)
+            self._pending = []
+        self._last_flush = time.monotonic()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+        return False
+
+
+def rebuild_rollups():
+    """Recomputes the monthly rollup from the ledger. Returns the number of months covered."""
+    if _use_sqlite():
+        return sqlite_backend.rebuild_rollups()
+    return len(_rollups.rebuild(_ledger_key(), iter_transactions()))
+
+def get_category_totals(month, transaction_type):
+    """Returns {category: cents} of one transaction type in a YYYY-MM month.
+
+    Answered from the monthly rollup, so it costs the same regardless of
+    ledger size. Categories appear in the order they were first recorded that month.
+    """
+    if _use_sqlite():
+        return sqlite_backend.get_category_totals(month, transaction_type)
+
+    months = _rollups.get(_ledger_key(), iter_transactions)
+    return dict(months.get(month, {}).get(transaction_type, {}))
+
+def get_month_total(month, transaction_type):
+    """Returns the total cents of one transaction type in a YYYY-MM month."""
+    return sum(get_category_totals(month, transaction_type).values())
+
+def rebuild_stats():
+    """Recomputes the amount statistics from the ledger. Returns the number of transactions covered."""
+    current = _stats.rebuild(_ledger_key(), iter_transactions())
+    return sum(
+        category_stats["count"] for by_category in current["categories"].values() for category_stats in by_category.values()
+    )
+
+def _get_stats():
+    return _stats.get(_ledger_key(), iter_transactions)
+
+def get_category_stats(transaction_type, category):
+    """Returns the count, mean, stddev, min, max, median and p95 of a category's amounts in cents, or None.
+
+    Kept up to date on every append, so this never reads the ledger unless
+    the statistics are stale.
+    """
+    category_stats = _get_stats()["categories"].get(transaction_type, {}).get(category)
+    return None if category_stats is None else stats.summary(category_stats)
+
+def get_unusual_expenses(month=None):
+    """Returns the most recent unusual expenses, optionally only those in a YYYY-MM month.
+
+    Each is a dict with the transaction's date, category, description and
+    amount, plus the category's mean amount when it was recorded.
+    """
+    fields = ("date", "category", "description", "amount", "category_mean")
+    index = None if month is None else month_index(month)
+    return [
+        dict(zip(fields, entry)) for entry in _get_stats()["unusual"]
+        if index is None or month_index(entry[0]) == index
+    ]
+
+def rebuild_totals():
+    """Recomputes the lifetime totals from the ledger and returns them."""
+    return _totals.rebuild(_ledger_key(), iter_transactions())
+
+def verify_totals():
+    """Recomputes the lifetime totals from the ledger, replacing the stored ones.
+
+    Returns (stored, actual); stored is None if there were no current totals.
+    """
+    stored = _totals.current(_ledger_key())
+    stored = None if stored is None else dict(stored)
+    return stored, dict(rebuild_totals())
+
+def get_type_totals():
+    """Returns the lifetime {type: cents} totals of the ledger.
+
+    Kept up to date on every append, so this costs the same regardless of
+    ledger size.
+    """
+    return dict(_totals.get(_ledger_key(), iter_transactions))
+
+def rebuild_fingerprints():
+    """Recomputes the fingerprint index from the ledger. Returns the number of transactions covered."""
+    return _fingerprints.rebuild(_ledger_key(), iter_transactions())["total"]
+
+def _get_fingerprints():
+    return _fingerprints.get(_ledger_key(), iter_transactions)["counts"]
+
+def is_duplicate(date, transaction_type, category, description, amount):
+    """Returns True if an identical transaction (ignoring case and spacing of text) is already recorded.
+
+    One lookup in the persisted fingerprint index; the ledger is only read
+    if the index is stale.
+    """
+    return fingerprints.fingerprint(date, transaction_type, category, description, amount) in _get_fingerprints()
+
+def split_duplicates(records):
+    """Splits (date, type, category, description, amount) records into (new, duplicates) against the ledger.
+
+    A record counts as a duplicate only while the ledger holds more copies of
+    it than earlier records in the batch have matched, see
+    fingerprints.split_duplicates().
+    """
+    return fingerprints.split_duplicates(_get_fingerprints(), records)
+
+def mark_duplicates(records):
+    """Lazily yields (record, is_duplicate) for records against the ledger, like split_duplicates().
+
+    The ledger must not be appended to until every record has been consumed.
+    """
+    return fingerprints.mark_duplicates(_get_fingerprints(), records)
+
+def _ordinal(day):
+    if isinstance(day, int):
+        return day
+    return date_to_ordinal(day) if isinstance(day, str) else day.toordinal()
+
+def get_day_index():
+    """Returns the DayIndex of the full ledger, built on first use and kept current on append."""
+    transactions = get_transactions()
+    index = _day_index["index"]
+    if index is None or index.store is not transactions or index.stale:
+        index = DayIndex(transactions)
+        _day_index["index"] = index
+    return index
+
+def range_total(start, end, transaction_type, category=None):
+    """Returns the total cents of one type, and optionally one category, dated from start to end inclusive.
+
+    start and end are dates, YYYY-MM-DD strings or day ordinals. Answered with two binary
+    searches over the day index, however many transactions fall in the range.
+    """
+    return get_day_index().total(_ordinal(start), _ordinal(end), transaction_type, category)
+
+def latest_transaction_date():
+    """Returns the date of the most recent transaction, or None if there are none."""
+    days = get_day_index().days
+    return date.fromordinal(days[-1]) if days else None
+
+def query(transaction_type=None, date_from=None, date_to=None, category=None, order_by=None, descending=False,
+          limit=None, month=None):
+    """Returns the transactions matching every given filter as a list of rows.
+
+    date_from and date_to are inclusive dates or YYYY-MM-DD strings, and month
+    (YYYY-MM) narrows the range to one month. order_by is None (ledger order),
+    "date" or "amount", reversed by descending; ties keep ledger order.
+    Filters are applied to the store's integer columns before any row is
+    built, a date range only visits the days inside it, and with a limit,
+    ordering by date stops early while ordering by amount keeps a bounded
+    heap instead of sorting every match.
+    """
+    return list(iter_query(transaction_type, date_from, date_to, category, order_by, descending, limit, month))
+
+def iter_query(transaction_type=None, date_from=None, date_to=None, category=None, order_by=None, descending=False,
+               limit=None, month=None, offset=0):
+    """Lazily yields the rows query() would return, skipping the first offset matches.
+
+    Rows are only built as they are consumed, so a caller can page through a
+    large result without holding it.
+    """
+    if order_by not in (None, "date", "amount"):
+        raise ValueError(f"Cannot order transactions by {order_by}")
+
+    transactions = get_transactions()
+    type_code = category_code = None
+    if transaction_type is not None:
+        type_code = transactions.type_code(transaction_type)
+        if type_code is None:
+            return
+    if category is not None:
+        category_code = transactions.category_code(category)
+        if category_code is None:
+            return
+
+    if order_by == "date" or date_from is not None or date_to is not None or month is not None:
+        start = _ordinal(date.min if date_from is None else date_from)
+        end = _ordinal(date.max if date_to is None else date_to)
+        if month is not None:
+            month_start, month_end = month_bounds(month)
+            start, end = max(start, month_start), min(end, month_end)
+        rows = get_day_index().rows(start, end, newest_first=order_by == "date" and descending)
+        if order_by != "date":
+            rows = sorted(rows)
+    else:
+        rows = range(len(transactions))
+
+    type_codes, category_codes = transactions.type_codes, transactions.category_codes
+    if type_code is not None:
+        rows = (row for row in rows if type_codes[row] == type_code)
+    if category_code is not None:
+        rows = (row for row in rows if category_codes[row] == category_code)
+
+    # limit counts rows after the first offset matches are skipped.
+    end = None if limit is None else offset + limit
+    if order_by == "amount":
+        amounts = transactions.amounts
+        if end is None:
+            rows = sorted(rows, key=amounts.__getitem__, reverse=descending)
+        elif descending:
+            rows = heapq.nsmallest(end, rows, key=lambda row: (-amounts[row], row))
+        else:
+            rows = heapq.nsmallest(end, rows, key=lambda row: (amounts[row], row))
+    for row in islice(rows, offset, end):
+        yield transactions[row]
+
+def transactions_above(month, threshold, transaction_type=None):
+    """Returns the transactions in a YYYY-MM month with amount above threshold cents, in ledger order.
+
+    A binary search over the month's amount-sorted index, built once per month
+    and ledger change.
+    """
+    index = get_day_index()
+    return [index.store[row] for row in index.rows_above(month, threshold, transaction_type)]
+
+def get_budgets():
+    """Reads all budgets as {category: cents}."""
+    if _use_sqlite():
+        return sqlite_backend.get_budgets()
+    return read_pairs(BUDGETS_FILE)
+
+def save_budget(category, amount):
+    """Saves a budget for a category."""
+    if _use_sqlite():
+        sqlite_backend.save_budget(category, amount)
+        return
+    budgets = get_budgets()
+    budgets[category] = amount
+    write_pairs(BUDGETS_FILE, budgets)
+
+def get_goals():
+    """Reads all savings goals as {name: cents}."""
+    if _use_sqlite():
+        return sqlite_backend.get_goals()
+    return read_pairs(GOALS_FILE)
+
+def get_goal_progress():
+    """Returns {name: {"target", "saved", "progress"}} for every goal, from lifetime savings.
+
+    saved is total income minus total expenses in cents and progress is a
+    percentage of the target.
+    """
+    type_totals = get_type_totals()
+    saved = type_totals.get("Income", 0) - type_totals.get("Expense", 0)
+    return {
+        name: {"target": amount, "saved": saved, "progress": (saved / amount) * 100 if amount > 0 else 0}
+        for name, amount in get_goals().items()
+    }
+
+def save_goal(name, amount):
+    """Saves a savings goal."""
+    if _use_sqlite():
+        sqlite_backend.save_goal(name, amount)
+        return
+    goals = get_goals()
+    goals[name] = amount
+    write_pairs(GOALS_FILE, goals)
@@ -0,0 +1,124 @@
+# features/transactions/day_index.py
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date
+from .store import ordinal_fields
+
+
+def month_bounds(month):
+    """Returns the first and last day ordinals of a YYYY-MM month."""
+    year, month_number = map(int, month.split("-"))
+    first = date(year, month_number, 1)
+    following = date(year + 1, 1, 1) if month_number == 12 else date(year, month_number + 1, 1)
+    return first.toordinal(), following.toordinal() - 1
+
+
+class DayIndex:
+    """Per-day prefix sums over a TransactionStore for O(log n) date-range totals.
+
+    days holds every distinct day ordinal in ascending order. For each
+    transaction type, and each (type, category) pair, a parallel array holds the
+    running total in cents up to and including that day, so any [start, end]
+    total is two binary searches and a subtraction. The index also keeps row
+    positions in date order for range listings, and builds amount-sorted
+    per-month indexes on demand for threshold lookups.
+
+    Appending a transaction dated on or after the latest day is O(1) (plus
+    O(keys) when a new day starts). A back-dated append marks the index stale
+    so its owner rebuilds it.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.stale = False
+        self.days = array("i")
+        self._prefix = {}
+        self._order = array("q")
+        self._day_offsets = array("q")
+        self._by_amount = {}
+
+        dates = store.dates
+        order = sorted(range(len(store)), key=dates.__getitem__)
+        for row in order:
+            self._add(row)
+
+    def _keys(self, row):
+        transaction_type = self.store.types[self.store.type_codes[row]]
+        return transaction_type, (transaction_type, self.store.categories[self.store.category_codes[row]])
+
+    def _add(self, row):
+        day = self.store.dates[row]
+        if self._by_amount:
+            year, month_number, _ = ordinal_fields(day)
+            month = f"{year:04d}-{month_number:02d}"
+            self._by_amount = {key: value for key, value in self._by_amount.items() if key[0] != month}
+        if not self.days or day > self.days[-1]:
+            self.days.append(day)
+            self._day_offsets.append(len(self._order))
+            for sums in self._prefix.values():
+                sums.append(sums[-1])
+        self._order.append(row)
+
+        amount = self.store.amounts[row]
+        for key in self._keys(row):
+            sums = self._prefix.get(key)
+            if sums is None:
+                sums = array("q", bytes(8 * len(self.days)))
+                self._prefix[key] = sums
+            sums[-1] += amount
+
+    def append(self, row):
+        """Indexes a row just appended to the store."""
+        if self.days and self.store.dates[row] < self.days[-1]:
+            self.stale = True
+        else:
+            self._add(row)
+
+    def _day_range(self, start, end):
+        return bisect_left(self.days, start), bisect_right(self.days, end)
+
+    def total(self, start, end, transaction_type, category=None):
+        """Returns the cents of one type (and optionally category) dated between two day ordinals, inclusive."""
+        key = transaction_type if category is None else (transaction_type, category)
+        sums = self._prefix.get(key)
+        first, last = self._day_range(start, end)
+        if sums is None or first >= last:
+            return 0
+        return sums[last - 1] - (sums[first - 1] if first else 0)
+
+    def rows(self, start, end, newest_first=False):
+        """Yields row positions dated between two day ordinals, inclusive, in date order.
+
+        Rows on the same day always keep the order they were recorded in.
+        """
+        first, last = self._day_range(start, end)
+        offsets, order = self._day_offsets, self._order
+        days = range(last - 1, first - 1, -1) if newest_first else range(first, last)
+        for day in days:
+            stop = offsets[day + 1] if day + 1 < len(offsets) else len(order)
+            yield from order[offsets[day]:stop]
+
+    def by_amount(self, month, transaction_type=None):
+        """Returns (keys, rows) for a YYYY-MM month, largest amount first with ties in ledger order.
+
+        keys holds the negated amounts, ascending, so it can be bisected. Built
+        on first use and kept until a transaction is added to that month.
+        """
+        key = (month, transaction_type)
+        entry = self._by_amount.get(key)
+        if entry is None:
+            store = self.store
+            type_code = None if transaction_type is None else store.type_code(transaction_type)
+            rows = [] if transaction_type is not None and type_code is None else self.rows(*month_bounds(month))
+            if type_code is not None:
+                rows = [row for row in rows if store.type_codes[row] == type_code]
+            amounts = store.amounts
+            rows = array("q", sorted(rows, key=lambda row: (-amounts[row], row)))
+            entry = (array("q", [-amounts[row] for row in rows]), rows)
+            self._by_amount[key] = entry
+        return entry
+
+    def rows_above(self, month, threshold, transaction_type=None):
+        """Returns the row positions in a YYYY-MM month with amount above threshold, in ledger order."""
+        keys, rows = self.by_amount(month, transaction_type)
+        return sorted(rows[:bisect_left(keys, -threshold)])
@@ -0,0 +1,128 @@
+# features/transactions/derived.py
+import os
+from . import jsonfile
+
+# Rows kept in a derived value's append log before its file is rewritten with them folded in.
+LOG_ROWS = 1000
+
+
+def load_json(path, ledger_key):
+    """Returns the value stored in a derived JSON file if it was built for this ledger signature, else None."""
+    stored = jsonfile.load(path)
+    if not isinstance(stored, dict) or stored.get("ledger") != jsonfile.normalize(ledger_key) or "value" not in stored:
+        return None
+    return stored["value"]
+
+def save_json(path, value, ledger_key, fsync=True):
+    """Persists a derived value together with the signature of the ledger it describes."""
+    jsonfile.write_atomic(path, {"ledger": ledger_key, "value": value}, fsync)
+
+
+class Derived:
+    """A value computed from the whole ledger and persisted next to it.
+
+    The stored value carries the signature of the ledger it describes. It is
+    extended with every batch appended through the app and rebuilt from the
+    ledger when the signatures no longer match, i.e. when the ledger was
+    changed behind its back, so a derived file lost in a crash costs only a
+    rebuild. The last value is also kept in memory.
+
+    Small batches are not written into the file: each one is appended as a
+    line of <path>.log, {"from": signature before, "ledger": signature after,
+    "records": [...]}, and replayed on load. Once the log would pass LOG_ROWS
+    rows the file is rewritten with them and the log removed.
+
+    empty() returns the value of an empty ledger and apply(value, records)
+    adds (date, type, category, description, amount) records to it in place.
+    load, save and extend default to a JSON file; extend(path, value, records,
+    ledger_key, fsync) lets a value that already holds records append them to
+    its file instead of rewriting it.
+    """
+
+    def __init__(self, path, empty, apply, load=load_json, save=save_json, extend=None):
+        self.path = path
+        self.log_path = f"{path}.log"
+        self.empty = empty
+        self.apply = apply
+        self._load = load
+        self._save = save
+        self._extend = extend
+        self.key = None
+        self.value = None
+        # Records in the log, i.e. not yet in the file.
+        self.pending = []
+
+    def _read(self, ledger_key):
+        """Loads the stored value and replays its log, returning None unless the result describes this ledger."""
+        entries = jsonfile.load_lines(self.log_path)
+        if not entries:
+            self.pending = []
+            return None if entries is None else self._load(self.path, ledger_key)
+        try:
+            key = entries[0]["from"]
+            value = self._load(self.path, key)
+            for entry in entries:
+                if value is None or entry["from"] != key:
+                    return None
+                value = self.apply(value, entry["records"])
+                key = entry["ledger"]
+        except (KeyError, TypeError, ValueError):
+            return None
+        if key != jsonfile.normalize(ledger_key):
+            return None
+        self.pending = [record for entry in entries for record in entry["records"]]
+        return value
+
+    def _drop_log(self):
+        try:
+            os.remove(self.log_path)
+        except FileNotFoundError:
+            pass
+        self.pending = []
+
+    def _write(self, value, ledger_key, fsync=True):
+        """Rewrites the file with a value built for this ledger signature; the log is dropped first."""
+        self._drop_log()
+        self._save(self.path, value, ledger_key, fsync)
+
+    def current(self, ledger_key):
+        """Returns the value if it describes the ledger with this signature, else None."""
+        if self.value is not None and self.key == ledger_key:
+            return self.value
+        value = self._read(ledger_key)
+        if value is not None:
+            self.key, self.value = ledger_key, value
+        return value
+
+    def rebuild(self, ledger_key, records):
+        """Recomputes the value from all of the ledger's records, persists it and returns it."""
+        value = self.apply(self.empty(), records)
+        self._write(value, ledger_key)
+        self.key, self.value = ledger_key, value
+        return value
+
+    def get(self, ledger_key, read_records):
+        """Returns the current value, rebuilding it from read_records() if it is stale."""
+        value = self.current(ledger_key)
+        return self.rebuild(ledger_key, read_records()) if value is None else value
+
+    def extend(self, value, records, ledger_key, fsync=False):
+        """Adds records just appended to the ledger, which now has this signature, to the current value.
+
+        value must be the one current() returned for the ledger before the
+        append. The log or file is forced to disk only with fsync=True,
+        matching the ledger write.
+        """
+        records = list(records)
+        value = self.apply(value, records)
+        if len(self.pending) + len(records) <= LOG_ROWS:
+            jsonfile.append_line(self.log_path, {"from": self.key, "ledger": ledger_key, "records": records}, fsync)
+            self.pending.extend(records)
+        elif self._extend is not None:
+            # The file lacks the logged records as well, so they are appended with the new ones.
+            unwritten = self.pending + records
+            self._drop_log()
+            self._extend(self.path, value, unwritten, ledger_key, fsync)
+        else:
+            self._write(value, ledger_key, fsync)
+        self.key, self.value = ledger_key, value
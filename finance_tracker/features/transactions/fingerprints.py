@@ -0,0 +1,117 @@
+# features/transactions/fingerprints.py
+"""Persisted hash index of transaction fingerprints, for spotting duplicates.
+
+A fingerprint is a 64-bit hash of a transaction's date, type, category,
+description (case and spacing ignored) and amount. The index counts how often
+each fingerprint occurs in the ledger, so checking a new transaction is one
+dictionary lookup. The hashes are kept in an append-only binary file next to
+the ledger, with a small JSON header holding the ledger signature and hash
+count, and kept current as a derived.Derived. Rebuild by hand with:
+
+    python -m features.transactions.fingerprints
+"""
+import os
+from array import array
+from hashlib import blake2b
+from itertools import chain, repeat
+from .derived import load_json, save_json
+
+# The hashes; fingerprints.json beside it holds the ledger signature and hash count.
+FINGERPRINTS_FILE = "database/fingerprints.bin"
+
+def fingerprint(date, transaction_type, category, description, amount):
+    """Returns the 64-bit fingerprint of one transaction."""
+    description = " ".join(str(description).split())
+    text = "\x1f".join((date, transaction_type, str(category).casefold(), description.casefold(), str(amount)))
+    return int.from_bytes(blake2b(text.encode("utf-8"), digest_size=8).digest(), "little")
+
+def hashes(records):
+    """Returns the fingerprints of (date, type, category, description, amount) records as an array."""
+    return array("Q", (fingerprint(*record) for record in records))
+
+def count(values, counts=None):
+    """Adds fingerprints to a {fingerprint: occurrences} dict."""
+    counts = {} if counts is None else counts
+    for value in values:
+        counts[value] = counts.get(value, 0) + 1
+    return counts
+
+def mark_duplicates(counts, records):
+    """Lazily yields (record, is_duplicate) for records against a {fingerprint: occurrences} dict.
+
+    A record is a duplicate while the ledger still holds an unmatched copy of
+    it, so importing a statement twice skips every row the second time, while
+    identical rows within one new statement are all kept. counts must not
+    change while the records are consumed.
+    """
+    matched = {}
+    for record in records:
+        value = fingerprint(*record)
+        if counts.get(value, 0) > matched.get(value, 0):
+            matched[value] = matched.get(value, 0) + 1
+            yield record, True
+        else:
+            yield record, False
+
+def split_duplicates(counts, records):
+    """Splits records into (new, duplicates) against a {fingerprint: occurrences} dict, see mark_duplicates()."""
+    new, duplicates = [], []
+    for record, duplicate in mark_duplicates(counts, records):
+        (duplicates if duplicate else new).append(record)
+    return new, duplicates
+
+def empty():
+    """Returns the index of an empty ledger: {fingerprint: occurrences} plus the number of fingerprints."""
+    return {"counts": {}, "total": 0}
+
+def apply(index, records):
+    """Adds the fingerprints of (date, type, category, description, amount) records to an index."""
+    values = hashes(records)
+    count(values, index["counts"])
+    index["total"] += len(values)
+    return index
+
+def _header_path(path):
+    return os.path.splitext(path)[0] + ".json"
+
+def load(path, ledger_key):
+    """Returns the stored index if its header says it was built for this ledger signature, else None."""
+    total = load_json(_header_path(path), ledger_key)
+    if total is None:
+        return None
+    values = array("Q")
+    try:
+        with open(path, "rb") as file:
+            values.frombytes(file.read())
+    except (FileNotFoundError, ValueError):
+        return None
+    if len(values) != total:
+        return None
+    return {"counts": count(values), "total": total}
+
+def save(path, index, ledger_key, fsync=True):
+    """Replaces the stored fingerprints with those of an index built for this ledger signature."""
+    values = array("Q", chain.from_iterable(repeat(value, occurrences) for value, occurrences in index["counts"].items()))
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as file:
+        values.tofile(file)
+        if fsync:
+            file.flush()
+            os.fsync(file.fileno())
+    os.replace(temp_path, path)
+    save_json(_header_path(path), index["total"], ledger_key, fsync)
+
+def extend(path, index, records, ledger_key, fsync=False):
+    """Appends the fingerprints of records already added to an index, instead of rewriting the file."""
+    with open(path, "ab") as file:
+        hashes(records).tofile(file)
+        if fsync:
+            file.flush()
+            os.fsync(file.fileno())
+    save_json(_header_path(path), index["total"], ledger_key, fsync)
+
+
+if __name__ == "__main__":
+    from .data import rebuild_fingerprints
+
+    print(f"Rebuilt fingerprints of {rebuild_fingerprints()} transactions.")
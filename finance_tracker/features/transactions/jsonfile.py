@@ -0,0 +1,49 @@
+# features/transactions/jsonfile.py
+import json
+import os
+
+def load(path, default=None):
+    """Reads a JSON file, returning default if it is missing or unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (FileNotFoundError, ValueError):
+        return default
+
+def write_atomic(path, data, fsync=True):
+    """Writes a JSON file so readers only ever see the old or the new contents.
+
+    With fsync=False the new contents are not forced to disk, so a crash may
+    leave the old contents or, after a power loss, an unreadable file.
+    """
+    # json.dumps runs the C encoder; json.dump would stream through the pure-Python one.
+    text = json.dumps(data, separators=(",", ":"))
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as file:
+        file.write(text)
+        if fsync:
+            file.flush()
+            os.fsync(file.fileno())
+    os.replace(temp_path, path)
+
+def append_line(path, data, fsync=False):
+    """Appends one JSON value as a line, for logs read back with load_lines()."""
+    with open(path, "a", encoding="utf-8") as file:
+        file.write(json.dumps(data, separators=(",", ":")) + "\n")
+        if fsync:
+            file.flush()
+            os.fsync(file.fileno())
+
+def load_lines(path):
+    """Reads a file of JSON lines, returning [] if it is missing and None if any line is unreadable."""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return [json.loads(line) for line in file]
+    except FileNotFoundError:
+        return []
+    except ValueError:
+        return None
+
+def normalize(value):
+    """Returns value as it reads back from JSON, e.g. tuples become lists."""
+    return json.loads(json.dumps(value))
@@ -0,0 +1,146 @@
+# features/transactions/parquet.py
+"""Columnar Parquet snapshots of the ledger (needs pyarrow).
+
+A snapshot stores dates as date32, type and category as dictionary-encoded
+strings, descriptions as strings and amounts as int64 cents, written straight
+from a TransactionStore's columns. It carries the signature of the ledger it
+was taken from, so it can stand in for re-parsing the ledger until the ledger
+changes. Take one by hand with:
+
+    python -m features.transactions.parquet
+"""
+import json
+from array import array
+from .store import FIELDS, TransactionStore
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+PARQUET_FILE = "database/transactions.parquet"
+
+# Schema metadata key holding the ledger signature.
+LEDGER_KEY = b"finance_tracker.ledger"
+
+# date.toordinal() of 1970-01-01, the date32 epoch.
+EPOCH_ORDINAL = 719163
+
+ROW_GROUP_ROWS = 128 * 1024
+
+
+def available():
+    """Returns True if pyarrow can be imported."""
+    return pa is not None
+
+def _schema():
+    return pa.schema([
+        ("date", pa.date32()),
+        ("type", pa.dictionary(pa.int8(), pa.string())),
+        ("category", pa.dictionary(pa.int32(), pa.string())),
+        ("description", pa.large_string()),
+        ("amount", pa.int64()),
+    ])
+
+def _wrap(arrow_type, values):
+    # Zero-copy view of an array.array as an Arrow array.
+    return pa.Array.from_buffers(arrow_type, len(values), [None, pa.py_buffer(values)])
+
+def store_to_table(store, ledger_key=None):
+    """Returns a TransactionStore as an Arrow table, sharing the store's buffers where it can."""
+    columns = store.columns()
+    size = len(store)
+    dates = pc.subtract(_wrap(pa.int32(), columns["dates"]), pa.scalar(EPOCH_ORDINAL, pa.int32()))
+    descriptions = pa.Array.from_buffers(
+        pa.large_string(), size,
+        [None, pa.py_buffer(columns["text_offsets"]), pa.py_buffer(columns["text"])],
+    )
+    table = pa.Table.from_arrays([
+        dates.cast(pa.date32()),
+        pa.DictionaryArray.from_arrays(_wrap(pa.uint8(), columns["type_codes"]).cast(pa.int8()),
+                                       pa.array(columns["types"], pa.string())),
+        pa.DictionaryArray.from_arrays(_wrap(pa.uint16(), columns["category_codes"]).cast(pa.int32()),
+                                       pa.array(columns["categories"], pa.string())),
+        descriptions,
+        _wrap(pa.int64(), columns["amounts"]),
+    ], schema=_schema())
+    if ledger_key is not None:
+        table = table.replace_schema_metadata({LEDGER_KEY: json.dumps(ledger_key).encode()})
+    return table
+
+def write(store, path=PARQUET_FILE, ledger_key=None):
+    """Writes a TransactionStore to a Parquet file, tagged with the ledger signature if given."""
+    pq.write_table(store_to_table(store, ledger_key), path, row_group_size=ROW_GROUP_ROWS)
+
+def ledger_key(path=PARQUET_FILE):
+    """Returns the ledger signature stored in a snapshot, or None if it is missing or has none."""
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+    except (FileNotFoundError, pa.ArrowInvalid):
+        return None
+    value = metadata.get(LEDGER_KEY)
+    return None if value is None else json.loads(value)
+
+def _values(column, typecode):
+    """Copies a null-free fixed-width Arrow column into an array.array."""
+    column = column.combine_chunks() if isinstance(column, pa.ChunkedArray) else column
+    values = array(typecode)
+    if not len(column):
+        return values
+    width = values.itemsize
+    values.frombytes(memoryview(column.buffers()[1])[column.offset * width:(column.offset + len(column)) * width])
+    return values
+
+def _codes(column, typecode, index_type):
+    column = column.combine_chunks()
+    return _values(column.indices.cast(index_type), typecode), column.dictionary.to_pylist()
+
+def read_store(path=PARQUET_FILE, descriptions=True):
+    """Reads a snapshot into a TransactionStore.
+
+    With descriptions=False the description column is not read at all and
+    every description is empty, for callers that only aggregate.
+    """
+    columns = list(FIELDS) if descriptions else [field for field in FIELDS if field != "description"]
+    table = pq.read_table(path, columns=columns).unify_dictionaries()
+
+    ordinals = pc.add(table.column("date").cast(pa.int32()), pa.scalar(EPOCH_ORDINAL, pa.int32()))
+    type_codes, types = _codes(table.column("type"), "B", pa.uint8())
+    category_codes, categories = _codes(table.column("category"), "H", pa.uint16())
+    text, text_offsets = b"", None
+    if descriptions and table.num_rows:
+        column = table.column("description").cast(pa.large_string()).combine_chunks()
+        _, offsets_buffer, data_buffer = column.buffers()
+        text_offsets = array("Q")
+        text_offsets.frombytes(memoryview(offsets_buffer)[column.offset * 8:(column.offset + len(column) + 1) * 8])
+        start, end = text_offsets[0], text_offsets[-1]
+        text = memoryview(data_buffer)[start:end] if data_buffer is not None else b""
+        if start:
+            text_offsets = array("Q", (offset - start for offset in text_offsets))
+
+    return TransactionStore.from_columns(
+        _values(ordinals, "i"), _values(table.column("amount"), "q"),
+        type_codes, types, category_codes, categories, text, text_offsets,
+    )
+
+def iter_records(path, batch_rows=ROW_GROUP_ROWS):
+    """Yields (date, type, category, description, amount) tuples from any Parquet file with those columns."""
+    for batch in pq.ParquetFile(path).iter_batches(batch_size=batch_rows, columns=list(FIELDS)):
+        dates = batch.column("date")
+        if not pa.types.is_string(dates.type):
+            dates = dates.cast(pa.string())
+        yield from zip(
+            dates.to_pylist(),
+            batch.column("type").to_pylist(),
+            batch.column("category").to_pylist(),
+            batch.column("description").to_pylist(),
+            batch.column("amount").to_pylist(),
+        )
+
+
+if __name__ == "__main__":
+    from .data import write_snapshot
+
+    print(f"Wrote {write_snapshot()} transactions to {PARQUET_FILE}.")
@@ -0,0 +1,98 @@
+# features/transactions/partitions.py
+"""Month-partitioned ledger layout: one database/transactions/YYYY-MM.txt file per month.
+
+The layout is used whenever the directory exists. Convert an existing
+single-file ledger with:
+
+    python -m features.transactions.partitions
+"""
+import os
+from .reader import iter_records
+
+TRANSACTIONS_DIR = "database/transactions"
+
+def is_partitioned(directory=TRANSACTIONS_DIR):
+    """Returns True if the month-partitioned layout is in use."""
+    return os.path.isdir(directory)
+
+def partition_path(month, directory=TRANSACTIONS_DIR):
+    """Returns the file holding the transactions of a YYYY-MM month."""
+    return os.path.join(directory, f"{month}.txt")
+
+def list_partitions(directory=TRANSACTIONS_DIR, months=None):
+    """Returns [(month, path)] for every partition, oldest first, optionally limited to some months."""
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+
+    partitions = []
+    for name in sorted(names):
+        month, extension = os.path.splitext(name)
+        if extension == ".txt" and (months is None or month in months):
+            partitions.append((month, os.path.join(directory, name)))
+    return partitions
+
+def months_between(start, end):
+    """Returns every YYYY-MM month from the date start to the date end, inclusive."""
+    months = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+def group_by_month(records):
+    """Groups (date, type, category, description, amount) records into {month: [records]}."""
+    groups = {}
+    for record in records:
+        groups.setdefault(record[0][:7], []).append(record)
+    return groups
+
+def append_lines(path, records, fsync=False):
+    """Appends records to one ledger file with a single write."""
+    lines = "".join(
+        f"{date},{transaction_type},{category},{description},{amount}\n"
+        for date, transaction_type, category, description, amount in records
+    )
+    with open(path, "a", encoding="utf-8") as file:
+        file.write(lines)
+        if fsync:
+            file.flush()
+            os.fsync(file.fileno())
+
+def convert_to_partitions(source, directory=TRANSACTIONS_DIR, batch_rows=10000):
+    """Splits a single-file ledger into month partitions.
+
+    The source file is renamed to <source>.bak afterwards so it is not read
+    twice. Returns the number of transactions converted.
+    """
+    if is_partitioned(directory):
+        raise ValueError(f"{directory} already exists; the ledger is already partitioned.")
+
+    # Write into a staging directory so a failed conversion leaves the old layout intact.
+    staging = directory + ".partial"
+    os.makedirs(staging)
+    count = 0
+    pending = []
+    for record in iter_records(source):
+        pending.append(record)
+        count += 1
+        if len(pending) >= batch_rows:
+            for month, records in group_by_month(pending).items():
+                append_lines(partition_path(month, staging), records)
+            pending = []
+    for month, records in group_by_month(pending).items():
+        append_lines(partition_path(month, staging), records)
+
+    os.rename(staging, directory)
+    if os.path.exists(source):
+        os.rename(source, source + ".bak")
+    return count
+
+
+if __name__ == "__main__":
+    from .data import TRANSACTIONS_FILE
+
+    count = convert_to_partitions(TRANSACTIONS_FILE)
+    print(f"Converted {count} transactions into {TRANSACTIONS_DIR}/YYYY-MM.txt partitions.")
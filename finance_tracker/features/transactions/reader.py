@@ -0,0 +1,49 @@
+# features/transactions/reader.py
+import mmap
+import os
+
+def split_line(line):
+    """Splits one ledger line into its date, type, category, description and amount."""
+    date, transaction_type, category, description, amount = line.strip().split(",")
+    return date, transaction_type, category, description, int(amount)
+
+def iter_records(path):
+    """Lazily yields (date, type, category, description, amount) tuples from a ledger file.
+
+    The file is memory-mapped and parsed one line at a time, so memory use does
+    not depend on the size of the ledger.
+    """
+    try:
+        file = open(path, "rb")
+    except FileNotFoundError:
+        return
+
+    with file:
+        # mmap refuses to map an empty file.
+        if os.fstat(file.fileno()).st_size == 0:
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+            for line in iter(view.readline, b""):
+                if line.strip():
+                    yield split_line(line.decode("utf-8"))
+
+def read_pairs(path):
+    """Reads a "name,amount" file such as budgets.txt or goals.txt into a dict."""
+    try:
+        with open(path, "r") as file:
+            lines = file.readlines()
+    except FileNotFoundError:
+        return {}
+
+    pairs = {}
+    for line in lines:
+        if line.strip():
+            name, amount = line.strip().split(",")
+            pairs[name] = int(amount)
+    return pairs
+
+def write_pairs(path, pairs):
+    """Writes a dict back to a "name,amount" file."""
+    with open(path, "w") as file:
+        for name, amount in pairs.items():
+            file.write(f"{name},{amount}\n")
@@ -0,0 +1,23 @@
+# features/transactions/rollups.py
+"""Persisted monthly rollups of the text ledger: cents summed by (month, type, category).
+
+Kept current as a derived.Derived, so monthly category totals never need a
+ledger scan. Rebuild it by hand with:
+
+    python -m features.transactions.rollups
+"""
+
+ROLLUPS_FILE = "database/rollups.json"
+
+def apply(months, records):
+    """Adds (date, type, category, description, amount) records to a {month: {type: {category: cents}}} rollup."""
+    for date, transaction_type, category, _, amount in records:
+        by_category = months.setdefault(date[:7], {}).setdefault(transaction_type, {})
+        by_category[category] = by_category.get(category, 0) + amount
+    return months
+
+
+if __name__ == "__main__":
+    from .data import rebuild_rollups
+
+    print(f"Rebuilt rollups for {rebuild_rollups()} months.")
@@ -0,0 +1,170 @@
+# features/transactions/sqlite_backend.py
+"""SQLite storage engine for transactions, budgets and goals.
+
+Selected with FINANCE_TRACKER_BACKEND=sqlite. Run this module once to copy the
+existing database/*.txt files into the SQLite database:
+
+    python -m features.transactions.sqlite_backend
+"""
+import sqlite3
+import threading
+
+SQLITE_FILE = "database/finance.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    type TEXT NOT NULL,
+    category TEXT NOT NULL,
+    description TEXT NOT NULL,
+    amount INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transactions_type_date_category
+    ON transactions (type, date, category, amount);
+CREATE INDEX IF NOT EXISTS idx_transactions_category_date
+    ON transactions (category, date);
+CREATE TABLE IF NOT EXISTS monthly_rollups (
+    month TEXT NOT NULL,
+    type TEXT NOT NULL,
+    category TEXT NOT NULL,
+    amount INTEGER NOT NULL,
+    first_id INTEGER NOT NULL,
+    PRIMARY KEY (month, type, category)
+);
+CREATE TRIGGER IF NOT EXISTS transactions_monthly_rollup AFTER INSERT ON transactions
+BEGIN
+    INSERT INTO monthly_rollups (month, type, category, amount, first_id)
+    VALUES (substr(NEW.date, 1, 7), NEW.type, NEW.category, NEW.amount, NEW.id)
+    ON CONFLICT (month, type, category) DO UPDATE SET amount = amount + excluded.amount;
+END;
+CREATE TABLE IF NOT EXISTS budgets (
+    category TEXT PRIMARY KEY,
+    amount INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS goals (
+    name TEXT PRIMARY KEY,
+    amount INTEGER NOT NULL
+);
+"""
+
+# SQLite connections cannot be shared across threads, and Streamlit runs each
+# session in its own thread, so connections are kept per thread.
+_local = threading.local()
+
+def connect(path=SQLITE_FILE):
+    """Returns this thread's connection to the database, creating the schema if needed."""
+    connections = _local.__dict__.setdefault("connections", {})
+    connection = connections.get(path)
+    if connection is None:
+        connection = sqlite3.connect(path)
+        connection.executescript(SCHEMA)
+        connections[path] = connection
+        # Databases created before the rollup table existed need it filled once.
+        if (connection.execute("SELECT 1 FROM transactions LIMIT 1").fetchone()
+                and not connection.execute("SELECT 1 FROM monthly_rollups LIMIT 1").fetchone()):
+            rebuild_rollups(path)
+    return connection
+
+def iter_transactions(path=SQLITE_FILE):
+    """Lazily yields every transaction as a (date, type, category, description, amount) tuple."""
+    return connect(path).execute(
+        "SELECT date, type, category, description, amount FROM transactions ORDER BY id"
+    )
+
+def save_transaction(date, transaction_type, category, description, amount, path=SQLITE_FILE):
+    """Inserts a transaction."""
+    with connect(path) as connection:
+        connection.execute(
+            "INSERT INTO transactions (date, type, category, description, amount) VALUES (?, ?, ?, ?, ?)",
+            (date, transaction_type, category, description, amount)
+        )
+
+def save_transactions(records, path=SQLITE_FILE):
+    """Inserts many (date, type, category, description, amount) records in one transaction."""
+    with connect(path) as connection:
+        connection.executemany(
+            "INSERT INTO transactions (date, type, category, description, amount) VALUES (?, ?, ?, ?, ?)",
+            records
+        )
+
+def get_category_totals(month, transaction_type, path=SQLITE_FILE):
+    """Returns {category: cents} for one month and type from the monthly rollup table."""
+    rows = connect(path).execute(
+        "SELECT category, amount FROM monthly_rollups"
+        " WHERE month = ? AND type = ? ORDER BY first_id",
+        (month, transaction_type)
+    )
+    return dict(rows)
+
+def rebuild_rollups(path=SQLITE_FILE):
+    """Recomputes the monthly rollup table from the transactions table.
+
+    Returns the number of months covered.
+    """
+    with connect(path) as connection:
+        connection.execute("DELETE FROM monthly_rollups")
+        connection.execute(
+            "INSERT INTO monthly_rollups (month, type, category, amount, first_id)"
+            " SELECT substr(date, 1, 7), type, category, SUM(amount), MIN(id)"
+            " FROM transactions GROUP BY substr(date, 1, 7), type, category"
+        )
+        return connection.execute("SELECT COUNT(DISTINCT month) FROM monthly_rollups").fetchone()[0]
+
+def get_budgets(path=SQLITE_FILE):
+    """Reads all budgets."""
+    return dict(connect(path).execute("SELECT category, amount FROM budgets ORDER BY rowid"))
+
+def save_budget(category, amount, path=SQLITE_FILE):
+    """Creates or updates the budget for a category."""
+    with connect(path) as connection:
+        connection.execute(
+            "INSERT INTO budgets (category, amount) VALUES (?, ?)"
+            " ON CONFLICT (category) DO UPDATE SET amount = excluded.amount",
+            (category, amount)
+        )
+
+def get_goals(path=SQLITE_FILE):
+    """Reads all savings goals."""
+    return dict(connect(path).execute("SELECT name, amount FROM goals ORDER BY rowid"))
+
+def save_goal(name, amount, path=SQLITE_FILE):
+    """Creates or updates a savings goal."""
+    with connect(path) as connection:
+        connection.execute(
+            "INSERT INTO goals (name, amount) VALUES (?, ?)"
+            " ON CONFLICT (name) DO UPDATE SET amount = excluded.amount",
+            (name, amount)
+        )
+
+def migrate_from_text(records, budgets, goals, path=SQLITE_FILE):
+    """Copies text ledger records plus budgets and goals into an empty SQLite database.
+
+    Returns the number of transactions migrated.
+    """
+    connection = connect(path)
+    if connection.execute("SELECT 1 FROM transactions LIMIT 1").fetchone():
+        raise ValueError(f"{path} already contains transactions; refusing to migrate twice.")
+
+    with connection:
+        cursor = connection.executemany(
+            "INSERT INTO transactions (date, type, category, description, amount) VALUES (?, ?, ?, ?, ?)",
+            records
+        )
+        connection.executemany("INSERT OR REPLACE INTO budgets (category, amount) VALUES (?, ?)", budgets.items())
+        connection.executemany("INSERT OR REPLACE INTO goals (name, amount) VALUES (?, ?)", goals.items())
+    return cursor.rowcount
+
+
+if __name__ == "__main__":
+    import os
+    import sys
+    from .data import BUDGETS_FILE, GOALS_FILE, TRANSACTIONS_FILE, _read_text_ledger
+    from .partitions import TRANSACTIONS_DIR, is_partitioned
+    from .reader import read_pairs
+
+    # Partitioning moves transactions.txt aside, so read whichever layout is in use.
+    if not is_partitioned() and not os.path.exists(TRANSACTIONS_FILE):
+        sys.exit(f"No text ledger at {TRANSACTIONS_FILE} or in {TRANSACTIONS_DIR}/; nothing to migrate.")
+    count = migrate_from_text(_read_text_ledger(), read_pairs(BUDGETS_FILE), read_pairs(GOALS_FILE))
+    print(f"Migrated {count} transactions into {SQLITE_FILE}.")
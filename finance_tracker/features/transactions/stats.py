@@ -0,0 +1,141 @@
+# features/transactions/stats.py
+"""Persisted streaming statistics of transaction amounts per (type, category).
+
+Each category keeps a running count, mean and variance (Welford's method) and
+P² estimates of the median and 95th percentile, so one transaction updates it
+in constant time and constant space; the statistics are kept current as a
+derived.Derived. Expenses far above their category's usual amount are
+recorded as they arrive. Rebuild by hand with:
+
+    python -m features.transactions.stats
+"""
+import math
+from bisect import insort
+
+STATS_FILE = "database/stats.json"
+
+# Quantiles estimated for every category.
+QUANTILES = (0.5, 0.95)
+
+# An expense is unusual when it is more than UNUSUAL_STDDEVS standard deviations
+# above its category's mean, once the category has MIN_SAMPLES earlier expenses.
+UNUSUAL_STDDEVS = 3
+MIN_SAMPLES = 10
+
+# Most recent unusual expenses kept.
+UNUSUAL_KEEP = 50
+
+def empty():
+    """Returns statistics describing an empty ledger."""
+    return {"categories": {}, "unusual": []}
+
+def _new_category():
+    return {
+        "count": 0, "mean": 0.0, "m2": 0.0, "min": None, "max": None,
+        "quantiles": {str(p): _new_quantile(p) for p in QUANTILES},
+    }
+
+def _new_quantile(p):
+    return {"heights": [], "positions": [1, 2, 3, 4, 5], "desired": [1, 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5]}
+
+def _add_quantile(estimate, p, value):
+    """Adds one observation to a P² quantile estimate (Jain & Chlamtac, 1985)."""
+    heights = estimate["heights"]
+    if len(heights) < 5:
+        insort(heights, value)
+        return
+    positions, desired = estimate["positions"], estimate["desired"]
+
+    if value < heights[0]:
+        heights[0] = value
+        cell = 0
+    elif value >= heights[4]:
+        heights[4] = value
+        cell = 3
+    else:
+        cell = next(i for i in range(4) if heights[i] <= value < heights[i + 1])
+    for i in range(cell + 1, 5):
+        positions[i] += 1
+    for i, increment in enumerate((0, p / 2, p, (1 + p) / 2, 1)):
+        desired[i] += increment
+
+    # Move the middle markers toward their desired positions.
+    for i in (1, 2, 3):
+        offset = desired[i] - positions[i]
+        if (offset >= 1 and positions[i + 1] - positions[i] > 1) or (offset <= -1 and positions[i - 1] - positions[i] < -1):
+            step = 1 if offset > 0 else -1
+            height = heights[i] + step / (positions[i + 1] - positions[i - 1]) * (
+                (positions[i] - positions[i - 1] + step) * (heights[i + 1] - heights[i]) / (positions[i + 1] - positions[i])
+                + (positions[i + 1] - positions[i] - step) * (heights[i] - heights[i - 1]) / (positions[i] - positions[i - 1])
+            )
+            if not heights[i - 1] < height < heights[i + 1]:
+                height = heights[i] + step * (heights[i + step] - heights[i]) / (positions[i + step] - positions[i])
+            heights[i] = height
+            positions[i] += step
+
+def _quantile_value(estimate, p):
+    heights = estimate["heights"]
+    if not heights:
+        return None
+    if len(heights) < 5:
+        return heights[round(p * (len(heights) - 1))]
+    return heights[2]
+
+def _add(category_stats, amount):
+    category_stats["count"] += 1
+    delta = amount - category_stats["mean"]
+    category_stats["mean"] += delta / category_stats["count"]
+    category_stats["m2"] += delta * (amount - category_stats["mean"])
+    category_stats["min"] = amount if category_stats["min"] is None else min(category_stats["min"], amount)
+    category_stats["max"] = amount if category_stats["max"] is None else max(category_stats["max"], amount)
+    for p in QUANTILES:
+        _add_quantile(category_stats["quantiles"][str(p)], p, amount)
+
+def stddev(category_stats):
+    """Returns the sample standard deviation of a category's amounts, or 0.0 with fewer than two."""
+    count = category_stats["count"]
+    return math.sqrt(category_stats["m2"] / (count - 1)) if count > 1 else 0.0
+
+def summary(category_stats):
+    """Returns the count, mean, stddev, min, max, median and p95 of a category's amounts."""
+    return {
+        "count": category_stats["count"],
+        "mean": category_stats["mean"],
+        "stddev": stddev(category_stats),
+        "min": category_stats["min"],
+        "max": category_stats["max"],
+        "median": _quantile_value(category_stats["quantiles"]["0.5"], 0.5),
+        "p95": _quantile_value(category_stats["quantiles"]["0.95"], 0.95),
+    }
+
+def is_unusual(category_stats, amount):
+    """Returns True if an amount is far above what the category usually sees."""
+    if category_stats["count"] < MIN_SAMPLES:
+        return False
+    spread = stddev(category_stats)
+    return spread > 0 and amount > category_stats["mean"] + UNUSUAL_STDDEVS * spread
+
+def apply(stats, records):
+    """Adds (date, type, category, description, amount) records to the statistics.
+
+    Each expense is checked against its category before it is added, and
+    unusual ones are appended to stats["unusual"].
+    """
+    categories, unusual = stats["categories"], stats["unusual"]
+    for date, transaction_type, category, description, amount in records:
+        category_stats = categories.setdefault(transaction_type, {}).get(category)
+        if category_stats is None:
+            category_stats = categories[transaction_type][category] = _new_category()
+        if transaction_type == "Expense" and is_unusual(category_stats, amount):
+            unusual.append([date, category, description, amount, round(category_stats["mean"])])
+            if len(unusual) > 2 * UNUSUAL_KEEP:
+                del unusual[:-UNUSUAL_KEEP]
+        _add(category_stats, amount)
+    del unusual[:-UNUSUAL_KEEP]
+    return stats
+
+
+if __name__ == "__main__":
+    from .data import rebuild_stats
+
+    print(f"Rebuilt statistics for {rebuild_stats()} transactions.")
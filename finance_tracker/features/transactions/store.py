@@ -0,0 +1,208 @@
+# features/transactions/store.py
+from array import array
+from collections.abc import Mapping
+from datetime import date
+
+FIELDS = ("date", "type", "category", "description", "amount")
+
+# Dates repeat heavily in a ledger, so every conversion below is memoized.
+_ordinals = {}
+_date_strings = {}
+_date_fields = {}
+_month_indexes = {}
+
+def parse_date(date_str):
+    """Parses a fixed-width YYYY-MM-DD string into (year, month, day) integers."""
+    if len(date_str) != 10 or date_str[4] != "-" or date_str[7] != "-":
+        raise ValueError(f"Invalid date, expected YYYY-MM-DD: {date_str!r}")
+    return int(date_str[:4]), int(date_str[5:7]), int(date_str[8:])
+
+def date_to_ordinal(date_str):
+    """Converts a YYYY-MM-DD string to a day ordinal."""
+    ordinal = _ordinals.get(date_str)
+    if ordinal is None:
+        ordinal = date(*parse_date(date_str)).toordinal()
+        _ordinals[date_str] = ordinal
+    return ordinal
+
+def ordinal_to_date(ordinal):
+    """Converts a day ordinal back to a YYYY-MM-DD string."""
+    date_str = _date_strings.get(ordinal)
+    if date_str is None:
+        date_str = date.fromordinal(ordinal).isoformat()
+        _date_strings[ordinal] = date_str
+    return date_str
+
+def ordinal_fields(ordinal):
+    """Returns the (year, month, day) integers of a day ordinal."""
+    fields = _date_fields.get(ordinal)
+    if fields is None:
+        day = date.fromordinal(ordinal)
+        fields = (day.year, day.month, day.day)
+        _date_fields[ordinal] = fields
+    return fields
+
+def month_index(value):
+    """Returns the months since 1970-01 of a YYYY-MM month or a YYYY-MM-DD date, for integer comparisons."""
+    index = _month_indexes.get(value)
+    if index is None:
+        if len(value) < 7 or value[4] != "-":
+            raise ValueError(f"Invalid month, expected YYYY-MM: {value!r}")
+        index = (int(value[:4]) - 1970) * 12 + int(value[5:7]) - 1
+        _month_indexes[value] = index
+    return index
+
+
+class TransactionRow(Mapping):
+    """Read-only, dict-like view of a single row in a TransactionStore."""
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store, index):
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, key):
+        store, i = self._store, self._index
+        if key == "amount":
+            return store.amounts[i]
+        if key == "type":
+            return store.types[store.type_codes[i]]
+        if key == "category":
+            return store.categories[store.category_codes[i]]
+        if key == "date":
+            return ordinal_to_date(store.dates[i])
+        if key == "description":
+            return store.description(i)
+        raise KeyError(key)
+
+    @property
+    def position(self):
+        """The row's position in its store, i.e. in ledger order."""
+        return self._index
+
+    def __iter__(self):
+        return iter(FIELDS)
+
+    def __len__(self):
+        return len(FIELDS)
+
+    def __repr__(self):
+        return f"TransactionRow({dict(self)!r})"
+
+
+class TransactionStore:
+    """Columnar in-memory transaction table.
+
+    Dates are day ordinals, amounts are cents, type and category are small-int
+    codes into interned lists, and descriptions live in one UTF-8 string pool.
+    Indexing or iterating yields TransactionRow views, so code written against
+    the old list of dicts keeps working.
+    """
+
+    def __init__(self):
+        self.dates = array("i")
+        self.amounts = array("q")
+        self.type_codes = array("B")
+        self.category_codes = array("H")
+        self.types = []
+        self.categories = []
+        self._type_ids = {}
+        self._category_ids = {}
+        self._text = bytearray()
+        self._text_offsets = array("Q", [0])
+
+    @classmethod
+    def from_columns(cls, dates, amounts, type_codes, types, category_codes, categories, text=b"", text_offsets=None):
+        """Builds a store from ready-made columns, as returned by columns().
+
+        dates, amounts, type_codes, category_codes and text_offsets are arrays
+        with the store's typecodes; text is the UTF-8 description pool. Without
+        text_offsets every description is empty.
+        """
+        store = cls()
+        store.dates, store.amounts = dates, amounts
+        store.type_codes, store.category_codes = type_codes, category_codes
+        store.types, store.categories = list(types), list(categories)
+        store._type_ids = {value: code for code, value in enumerate(store.types)}
+        store._category_ids = {value: code for code, value in enumerate(store.categories)}
+        store._text = bytearray(text)
+        store._text_offsets = text_offsets if text_offsets is not None else array("Q", bytes(8 * (len(amounts) + 1)))
+        return store
+
+    def columns(self):
+        """Returns the raw columns as keyword arguments for from_columns()."""
+        return {
+            "dates": self.dates, "amounts": self.amounts,
+            "type_codes": self.type_codes, "types": self.types,
+            "category_codes": self.category_codes, "categories": self.categories,
+            "text": self._text, "text_offsets": self._text_offsets,
+        }
+
+    def _intern(self, value, values, ids):
+        code = ids.get(value)
+        if code is None:
+            code = len(values)
+            values.append(value)
+            ids[value] = code
+        return code
+
+    def type_code(self, transaction_type):
+        """Returns the code of a transaction type, or None if it never occurs."""
+        return self._type_ids.get(transaction_type)
+
+    def category_code(self, category):
+        """Returns the code of a category, or None if it never occurs."""
+        return self._category_ids.get(category)
+
+    def append(self, date_str, transaction_type, category, description, amount):
+        """Appends one transaction to the store."""
+        self.dates.append(date_to_ordinal(date_str))
+        self.amounts.append(amount)
+        self.type_codes.append(self._intern(transaction_type, self.types, self._type_ids))
+        self.category_codes.append(self._intern(category, self.categories, self._category_ids))
+        self._text += description.encode("utf-8")
+        self._text_offsets.append(len(self._text))
+
+    def description(self, index):
+        """Returns the description of the row at the given index."""
+        start, end = self._text_offsets[index], self._text_offsets[index + 1]
+        return self._text[start:end].decode("utf-8")
+
+    def descriptions(self):
+        """Returns every description as a list, decoding the pool in one go when it is plain ASCII."""
+        offsets = self._text_offsets
+        if self._text.isascii():
+            text = self._text.decode("ascii")
+            return [text[offsets[i]:offsets[i + 1]] for i in range(len(self))]
+        return [self.description(i) for i in range(len(self))]
+
+    def records(self):
+        """Yields each row as a (date, type, category, description, amount) tuple."""
+        types, categories = self.types, self.categories
+        for i in range(len(self)):
+            yield (
+                ordinal_to_date(self.dates[i]),
+                types[self.type_codes[i]],
+                categories[self.category_codes[i]],
+                self.description(i),
+                self.amounts[i]
+            )
+
+    def to_dicts(self):
+        """Materializes the store as a list of plain transaction dicts."""
+        return [dict(row) for row in self]
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("transaction index out of range")
+        return TransactionRow(self, index)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield TransactionRow(self, i)
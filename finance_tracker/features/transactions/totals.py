@@ -0,0 +1,26 @@
+# features/transactions/totals.py
+"""Persisted lifetime totals of the ledger: cents summed by transaction type.
+
+Kept current as a derived.Derived, so the balance and goal progress never
+need a ledger scan. Check them against the ledger and repair them with:
+
+    python -m features.transactions.totals
+"""
+
+TOTALS_FILE = "database/totals.json"
+
+def apply(totals, records):
+    """Adds (date, type, category, description, amount) records to a {type: cents} total."""
+    for _, transaction_type, _, _, amount in records:
+        totals[transaction_type] = totals.get(transaction_type, 0) + amount
+    return totals
+
+
+if __name__ == "__main__":
+    from .data import verify_totals
+
+    stored, actual = verify_totals()
+    if stored == actual:
+        print("Running totals match the ledger.")
+    else:
+        print(f"Running totals were {stored}; rebuilt from the ledger as {actual}.")
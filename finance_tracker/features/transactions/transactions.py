@@ -1,13 +1,21 @@
+import os
+import shlex
+import subprocess
+import sys
 from datetime import datetime, timedelta
+from itertools import islice
 import questionary
 from rich.console import Console
 from rich.table import Table
 from rich.panel import Panel
-from .data import get_transactions, save_transaction
+from .data import get_type_totals, has_transactions, is_duplicate, iter_query, save_transaction
 
 # Create a console object
 console = Console()
 
+# Rows per page of list_transactions, and per write when streaming plain text.
+PAGE_SIZE = 50
+
 def add_expense():
     """Adds an expense transaction."""
     console.print("[bold blue]Adding a new expense...[/bold blue]")
@@ -39,6 +47,12 @@ def add_expense():
             console.print("[bold red]Invalid date format. Please use YYYY-MM-DD.[/bold red]")
             return
 
+    if is_duplicate(date, "Expense", category, description, amount) and not questionary.confirm(
+        "An identical transaction is already recorded. Save it anyway?", default=False
+    ).ask():
+        console.print("[yellow]Expense not saved.[/yellow]")
+        return
+
     save_transaction(date, "Expense", category, description, amount)
     console.print("[bold green]Expense added successfully![/bold green]")
 
@@ -74,14 +88,89 @@ def add_income():
             console.print("[bold red]Invalid date format. Please use YYYY-MM-DD.[/bold red]")
             return
 
+    if is_duplicate(date, "Income", category, description, amount) and not questionary.confirm(
+        "An identical transaction is already recorded. Save it anyway?", default=False
+    ).ask():
+        console.print("[yellow]Income not saved.[/yellow]")
+        return
+
     save_transaction(date, "Income", category, description, amount)
     console.print("[bold green]Income added successfully![/bold green]")
 
-def list_transactions():
-    """Lists all transactions."""
-    transactions = get_transactions()
+def _new_table():
+    table = Table(title="Transactions")
+    table.add_column("Date", style="cyan")
+    table.add_column("Type", style="magenta")
+    table.add_column("Category", style="yellow")
+    table.add_column("Description", style="blue")
+    table.add_column("Amount", justify="right", style="green")
+    return table
+
+def _add_table_row(table, transaction):
+    amount_display = f"{transaction['amount'] / 100:.2f}"
+    color = "red" if transaction["type"] == "Expense" else "green"
+    table.add_row(
+        transaction["date"],
+        transaction["type"],
+        transaction["category"],
+        transaction["description"],
+        f"[{color}]{amount_display}[/{color}]"
+    )
 
-    if not transactions:
+def _plain_lines(transactions):
+    """Formats transactions as plain, fixed-width text lines."""
+    for t in transactions:
+        yield f"{t['date']}  {t['type']:<7}  {t['category']:<13}  {t['amount'] / 100:>12.2f}  {t['description']}\n"
+
+def _show_pages(transactions):
+    """Renders one table of PAGE_SIZE rows at a time, fetching the next page only when asked."""
+    page_number = 1
+    page = list(islice(transactions, PAGE_SIZE))
+    while page:
+        table = _new_table()
+        table.title = f"Transactions (page {page_number})"
+        for transaction in page:
+            _add_table_row(table, transaction)
+        console.print(table)
+
+        page = list(islice(transactions, PAGE_SIZE))
+        if not page or not questionary.confirm("Show the next page?").ask():
+            return
+        page_number += 1
+
+def _write_plain(transactions, stream):
+    """Writes transactions as plain text, a batch of lines per write."""
+    lines = _plain_lines(transactions)
+    while True:
+        batch = "".join(islice(lines, PAGE_SIZE))
+        if not batch:
+            return
+        stream.write(batch)
+
+def _show_in_pager(transactions):
+    """Streams transactions as plain text into $PAGER (default: less), falling back to stdout.
+
+    An empty $PAGER means no pager.
+    """
+    try:
+        command = shlex.split(os.environ.get("PAGER", "less"))
+        if not command:
+            raise ValueError("no pager")
+        pager = subprocess.Popen(command, stdin=subprocess.PIPE, text=True)
+    except (FileNotFoundError, ValueError):
+        _write_plain(transactions, sys.stdout)
+        return
+    try:
+        _write_plain(transactions, pager.stdin)
+        pager.stdin.close()
+    except BrokenPipeError:
+        # The pager was closed before every row was shown.
+        pass
+    pager.wait()
+
+def list_transactions():
+    """Lists transactions, a page at a time, in a pager or as plain text."""
+    if not has_transactions():
         console.print("[bold yellow]No transactions found.[/bold yellow]")
         return
 
@@ -92,56 +181,31 @@ def list_transactions():
 
     filter_days = questionary.confirm("Filter by last 7 days?").ask()
 
-    table = Table(title="Transactions")
-    table.add_column("Date", style="cyan")
-    table.add_column("Type", style="magenta")
-    table.add_column("Category", style="yellow")
-    table.add_column("Description", style="blue")
-    table.add_column("Amount", justify="right", style="green")
+    output = questionary.select(
+        "Show transactions:",
+        choices=["Page by page", "In a pager", "As plain text"]
+    ).ask()
 
-    # Sort transactions by date (newest first)
-    transactions.sort(key=lambda t: t["date"], reverse=True)
-    
-    today = datetime.now().date()
-    seven_days_ago = today - timedelta(days=7)
-
-    for transaction in transactions:
-        transaction_date = datetime.strptime(transaction["date"], "%Y-%m-%d").date()
-        
-        # Filter by last 7 days
-        if filter_days and transaction_date < seven_days_ago:
-            continue
-            
-        amount_display = f"{transaction['amount'] / 100:.2f}"
-        if transaction["type"] == "Expense":
-            if filter_type == "Income only":
-                continue
-            table.add_row(
-                transaction["date"],
-                transaction["type"],
-                transaction["category"],
-                transaction["description"],
-                f"[red]{amount_display}[/red]"
-            )
-        elif transaction["type"] == "Income":
-            if filter_type == "Expenses only":
-                continue
-            table.add_row(
-                transaction["date"],
-                transaction["type"],
-                transaction["category"],
-                transaction["description"],
-                f"[green]{amount_display}[/green]"
-            )
-    
-    console.print(table)
+    # Newest first; rows are fetched lazily as each page or line is written
+    transaction_type = {"Expenses only": "Expense", "Income only": "Income"}.get(filter_type)
+    date_from = datetime.now().date() - timedelta(days=7) if filter_days else None
+    transactions = (
+        t for t in iter_query(transaction_type=transaction_type, date_from=date_from, order_by="date", descending=True)
+        if t["type"] in ("Expense", "Income")
+    )
+
+    if output == "In a pager":
+        _show_in_pager(transactions)
+    elif output == "As plain text":
+        _write_plain(transactions, sys.stdout)
+    else:
+        _show_pages(transactions)
     
 def show_balance():
     """Calculates and displays the current balance."""
-    transactions = get_transactions()
-    
-    total_income = sum(t["amount"] for t in transactions if t["type"] == "Income")
-    total_expenses = sum(t["amount"] for t in transactions if t["type"] == "Expense")
+    type_totals = get_type_totals()
+    total_income = type_totals.get("Income", 0)
+    total_expenses = type_totals.get("Expense", 0)
     balance = total_income - total_expenses
 
     balance_color = "green" if balance >= 0 else "red"
@@ -121,14 +121,40 @@ def handle_data_management():
             choices=[
                 "Export to CSV",
                 "Export to JSON",
+                "Export to JSON Lines",
+                "Import from JSON Lines",
+                "Export to Parquet",
+                "Import from Parquet",
+                "Bulk Import (CSV/JSON)",
+                "Verify Running Totals",
                 "Back"
             ]
         ).ask()
 
         if choice == "Export to CSV":
-            data_management.export_to_csv()
+            data_management.export_to_csv_interactive()
         elif choice == "Export to JSON":
             data_management.export_to_json()
+        elif choice == "Export to JSON Lines":
+            data_management.export_to_ndjson()
+        elif choice == "Import from JSON Lines":
+            path = questionary.text("Import from:", default=data_management.NDJSON_FILE).ask()
+            if path:
+                skip_duplicates = questionary.confirm("Skip transactions that are already in the ledger?", default=True).ask()
+                data_management.import_from_ndjson(path, skip_duplicates=skip_duplicates)
+        elif choice == "Export to Parquet":
+            path = questionary.text("Export to:", default=data_management.PARQUET_FILE).ask()
+            if path:
+                data_management.export_to_parquet(path)
+        elif choice == "Import from Parquet":
+            path = questionary.text("Import from:", default=data_management.PARQUET_FILE).ask()
+            if path:
+                skip_duplicates = questionary.confirm("Skip transactions that are already in the ledger?", default=True).ask()
+                data_management.import_from_parquet(path, skip_duplicates=skip_duplicates)
+        elif choice == "Bulk Import (CSV/JSON)":
+            data_management.import_file_interactive()
+        elif choice == "Verify Running Totals":
+            data_management.verify_running_totals()
         elif choice == "Back":
             break
 